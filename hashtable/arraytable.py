@@ -0,0 +1,258 @@
+'''NumPy backend for hashTable, for integer keys
+
+Keys, values and slot states live in three flat NumPy arrays instead of boxed Python objects.
+Batch calls (get_many, set_many, contains_many, delete_many) hash and probe every key at once:
+each round of linear probing is one set of array operations over all keys still unresolved,
+so the Python-level loop runs once per probe step rather than once per key.
+
+- Capacity is rounded up to a power of two so a slot is hash & mask
+- Keys are hashed with the SplitMix64 finaliser, which scatters sequential IDs across the table
+- Unlike hashTable, iteration order is slot order, not insertion order
+'''
+import numpy as np
+
+from hashtable import DEFAULT_LOAD_FACTOR
+
+_EMPTY = 0
+_FULL = 1
+_DELETED = 2 # Tombstone, probing carries on past it
+
+def _mix(keys):
+    # SplitMix64 finaliser, wraps mod 2**64 the same way the C version does
+    z = keys.astype(np.uint64)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+    return z ^ (z >> np.uint64(31))
+
+class ArrayHashTable:
+
+    def __init__(self, max_capacity, max_load_factor=DEFAULT_LOAD_FACTOR, key_dtype='int64', value_dtype='int64'):
+        if max_capacity <= 0:
+            raise ValueError('Max capacity must be a positive number')
+        if not 0 < max_load_factor < 1:
+            raise ValueError('Max load factor must be between 0 and 1')
+        self.key_dtype = np.dtype(key_dtype)
+        self.value_dtype = np.dtype(value_dtype)
+        if self.key_dtype.kind not in 'iu':
+            raise TypeError(f'Key dtype must be an integer type, not {self.key_dtype}')
+        if self.value_dtype.kind not in 'biufc': # Objects and strings belong in hashTable
+            raise TypeError(f'Value dtype must be a numeric type, not {self.value_dtype}')
+        self._max_load_factor = max_load_factor
+        self._allocate(1 << (max_capacity - 1).bit_length())
+
+    def _allocate(self, capacity):
+        self._keys = np.zeros(capacity, dtype=self.key_dtype)
+        self._values = np.zeros(capacity, dtype=self.value_dtype)
+        self._state = np.zeros(capacity, dtype=np.uint8)
+        self._mask = np.uint64(capacity - 1)
+        self._len = 0
+        self._filled = 0 # FULL plus DELETED slots
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, key):
+        try:
+            keys = self._as_keys([key])
+        except (OverflowError, TypeError, ValueError): # Can't be stored in key_dtype, so can't be in the table
+            raise KeyError(key) from None
+        slot = self._locate(keys)[0]
+        if slot < 0:
+            raise KeyError(key)
+        return self._values[slot].item()
+
+    def __setitem__(self, key, value):
+        self.set_many([key], [value])
+
+    def __delitem__(self, key):
+        try:
+            self.delete_many([key])
+        except (OverflowError, TypeError, ValueError):
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        try:
+            keys = self._as_keys([key])
+        except (OverflowError, TypeError, ValueError): # Can't be stored in key_dtype, so can't be in the table
+            return False
+        return bool(self._locate(keys)[0] >= 0)
+
+    def __iter__(self):
+        yield from self.keys().tolist()
+
+    def __str__(self):
+        pairs = [f'{key!r}: {val!r}' for key, val in self.items()]
+        return '{' + ', '.join(pairs) + '}'
+
+    def __repr__(self):
+        cls = self.__class__.__name__
+        return f'{cls}({self.capacity}, key_dtype={self.key_dtype.name!r}, value_dtype={self.value_dtype.name!r})'
+
+    def __eq__(self, other_table):
+        if self is other_table:
+            return True
+        if type(self) is not type(other_table):
+            return False
+        if len(self) != len(other_table):
+            return False
+        keys = self.keys()
+        slots = other_table._locate(keys)
+        if (slots < 0).any():
+            return False
+        return bool((other_table._values[slots] == self._values[self._live]).all())
+
+    @property
+    def capacity(self):
+        return len(self._state)
+
+    @property
+    def load_factor(self):
+        return self._len / self.capacity
+
+    @property
+    def nbytes(self):
+        return self._keys.nbytes + self._values.nbytes + self._state.nbytes
+
+    @property
+    def _live(self):
+        return self._state == _FULL
+
+    def keys(self):
+        return self._keys[self._live]
+
+    def values(self):
+        return self._values[self._live]
+
+    def items(self):
+        live = self._live
+        return list(zip(self._keys[live].tolist(), self._values[live].tolist()))
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def copy(self):
+        table = ArrayHashTable.__new__(ArrayHashTable)
+        table.key_dtype = self.key_dtype
+        table.value_dtype = self.value_dtype
+        table._max_load_factor = self._max_load_factor
+        table._keys = self._keys.copy()
+        table._values = self._values.copy()
+        table._state = self._state.copy()
+        table._mask = self._mask
+        table._len = self._len
+        table._filled = self._filled
+        return table
+
+    def _as_keys(self, keys):
+        # Refuses values that would wrap when cast, rather than silently looking up the wrong key
+        keys = np.asarray(keys)
+        if keys.dtype != self.key_dtype:
+            if keys.dtype.kind not in 'iu' and keys.size:
+                raise TypeError(f'Keys must be integers, not {keys.dtype}')
+            info = np.iinfo(self.key_dtype)
+            if keys.size and (keys.min() < info.min or keys.max() > info.max):
+                raise OverflowError(f'Keys out of range for {self.key_dtype}')
+            keys = keys.astype(self.key_dtype)
+        return keys.ravel()
+
+    def _as_values(self, values):
+        # Same idea for values: refuses casts that would truncate (1.9 -> 1) or wrap, rather than storing something else
+        values = np.asarray(values)
+        if values.dtype != self.value_dtype and values.size:
+            if not np.can_cast(values.dtype, self.value_dtype, casting='same_kind'):
+                raise TypeError(f'Values of type {values.dtype} would be truncated as {self.value_dtype}')
+            if values.dtype.kind in 'iu' and self.value_dtype.kind in 'iu':
+                info = np.iinfo(self.value_dtype)
+                if values.min() < info.min or values.max() > info.max:
+                    raise OverflowError(f'Values out of range for {self.value_dtype}')
+        return values.astype(self.value_dtype)
+
+    def _locate(self, keys):
+        # Slot holding each key, -1 where it's missing
+        table_keys = self._keys
+        state = self._state
+        mask = self._mask
+        slots = np.full(len(keys), -1, dtype=np.intp)
+        pending = np.arange(len(keys))
+        probe = _mix(keys) & mask
+        while pending.size:
+            slot = probe.astype(np.intp)
+            slot_state = state[slot]
+            hit = (slot_state == _FULL) & (table_keys[slot] == keys[pending])
+            slots[pending[hit]] = slot[hit]
+            unresolved = ~hit & (slot_state != _EMPTY)
+            pending = pending[unresolved]
+            probe = (probe[unresolved] + np.uint64(1)) & mask
+        return slots
+
+    def _place(self, keys, values):
+        # Insert keys that are known to be missing and unique. Keys probing for the same free slot
+        # in the same round are settled by letting the first one have it and moving the rest on.
+        state = self._state
+        mask = self._mask
+        pending = np.arange(len(keys))
+        probe = _mix(keys) & mask
+        while pending.size:
+            slot = probe.astype(np.intp)
+            free = np.flatnonzero(state[slot] != _FULL)
+            _, first = np.unique(slot[free], return_index=True)
+            winners = free[first]
+            won = slot[winners]
+            self._filled += int((state[won] == _EMPTY).sum())
+            state[won] = _FULL
+            self._keys[won] = keys[pending[winners]]
+            self._values[won] = values[pending[winners]]
+            waiting = np.ones(len(pending), dtype=bool)
+            waiting[winners] = False
+            pending = pending[waiting]
+            probe = (probe[waiting] + np.uint64(1)) & mask
+        self._len += len(keys)
+
+    def _reserve(self, count):
+        # Rebuilds in one vectorised pass, which also clears out tombstones
+        usable = min(int(self.capacity * self._max_load_factor), self.capacity - 1)
+        if self._filled + count <= usable:
+            return
+        live = self._live
+        keys, values = self._keys[live], self._values[live]
+        needed = int((self._len + count) / self._max_load_factor) + 2
+        self._allocate(max(self.capacity, 1 << (needed - 1).bit_length()))
+        self._place(keys, values)
+
+    def contains_many(self, keys):
+        return self._locate(self._as_keys(keys)) >= 0
+
+    def get_many(self, keys, default=0):
+        slots = self._locate(self._as_keys(keys))
+        results = np.full(len(slots), default, dtype=self.value_dtype)
+        found = slots >= 0
+        results[found] = self._values[slots[found]]
+        return results
+
+    def set_many(self, keys, values):
+        keys = self._as_keys(keys)
+        values = np.broadcast_to(self._as_values(values), keys.shape)
+        # Last write wins for repeated keys, same as setting them one at a time
+        _, last = np.unique(keys[::-1], return_index=True)
+        last = len(keys) - 1 - last
+        keys, values = keys[last], values[last]
+        slots = self._locate(keys)
+        found = slots >= 0
+        self._values[slots[found]] = values[found]
+        missing = ~found
+        if missing.any():
+            self._reserve(int(missing.sum()))
+            self._place(keys[missing], values[missing])
+
+    def delete_many(self, keys):
+        keys = self._as_keys(keys)
+        keys = np.unique(keys)
+        slots = self._locate(keys)
+        missing = slots < 0
+        if missing.any():
+            raise KeyError(keys[missing][0].item())
+        self._state[slots] = _DELETED
+        self._len -= len(slots)
@@ -0,0 +1,212 @@
+'''Reproducible benchmarks for hashTable, with the built-in dict as the yardstick
+
+    python benchmark.py run --sizes 1e3 1e5 --output results.json
+    python benchmark.py compare baseline.json results.json --threshold 0.1
+
+run times set, get, contains, len, iteration, copy, == and from_dict, plus a mixed
+get/set/delete workload (--mix gives the ratios), for int, str and tuple keys at each size.
+Lookups are run with uniform and Zipfian (--zipf exponent) access. Each result has ops/sec
+from an untimed loop and p50/p99 latency from timing up to LATENCY_SAMPLES operations one by
+one, for hashTable and dict, and memory results give bytes per entry as tracemalloc sees the
+table being built (the keys and values themselves aren't counted). Everything is seeded, so
+two runs do the same work.
+
+compare exits with status 1 if any hashTable ops/sec dropped, or bytes per entry grew, by
+more than the threshold. Run both sides on the same machine: dict's numbers are only there
+to read the results against, and aren't compared.
+'''
+import argparse
+import json
+import operator
+import platform
+import random
+import sys
+import tracemalloc
+from itertools import accumulate
+from time import perf_counter, perf_counter_ns
+
+from hashtable import hashTable
+
+KEY_KINDS = ('int', 'str', 'tuple')
+ACCESSES = ('uniform', 'zipf')
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_MIX = (0.8, 0.15, 0.05) # get, set, delete
+DEFAULT_OPERATIONS = 100000
+LATENCY_SAMPLES = 10000
+
+IMPLEMENTATIONS = {
+    'hashTable': (lambda: hashTable(8), hashTable.from_dict),
+    'dict': (dict, dict),
+}
+
+def make_keys(kind, size, seed=0):
+    rnd = random.Random(seed)
+    numbers = rnd.sample(range(size * 10), size)
+    if kind == 'int':
+        return numbers
+    if kind == 'str':
+        return [f'key:{number}' for number in numbers]
+    if kind == 'tuple':
+        return [(number, f'key:{number}') for number in numbers]
+    raise ValueError(f'Key kind must be one of {KEY_KINDS}, not {kind!r}')
+
+def make_accesses(keys, access, count, seed=0, zipf=1.1):
+    # Zipfian: the key at rank r (in insertion order) is picked in proportion to 1 / r ** zipf
+    rnd = random.Random(seed)
+    if access == 'uniform':
+        return rnd.choices(keys, k=count)
+    if access == 'zipf':
+        return rnd.choices(keys, cum_weights=list(accumulate(1 / rank ** zipf for rank in range(1, len(keys) + 1))), k=count)
+    raise ValueError(f'Access must be one of {ACCESSES}, not {access!r}')
+
+def _set(table, key):
+    table[key] = key
+
+def _mixed(table, step):
+    key, operation = step
+    if operation == 0:
+        table.get(key)
+    elif operation == 1:
+        table[key] = key
+    else:
+        try:
+            del table[key]
+        except KeyError:
+            pass
+
+def _iterate(table, _):
+    for _ in table:
+        pass
+
+def _time(function, table, arguments):
+    # (ops/sec over every argument, p50 and p99 ns over a sample of them). Mutating workloads get a fresh table per pass.
+    fresh = table if callable(table) else lambda: table
+    subject = fresh()
+    start = perf_counter()
+    for argument in arguments:
+        function(subject, argument)
+    ops_per_sec = len(arguments) / (perf_counter() - start)
+    subject = fresh()
+    latencies = []
+    for argument in arguments[:LATENCY_SAMPLES]:
+        begin = perf_counter_ns()
+        function(subject, argument)
+        latencies.append(perf_counter_ns() - begin)
+    latencies.sort()
+    return {
+        'ops_per_sec': ops_per_sec,
+        'p50_ns': latencies[len(latencies) // 2],
+        'p99_ns': latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)],
+    }
+
+def bytes_per_entry(build, data):
+    tracemalloc.start()
+    try:
+        table = build(data)
+        nbytes = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del table
+    return nbytes / len(data)
+
+def run(sizes=DEFAULT_SIZES, key_kinds=KEY_KINDS, accesses=ACCESSES, mix=DEFAULT_MIX,
+        operations=DEFAULT_OPERATIONS, seed=0, zipf=1.1, report=None):
+    results = {}
+
+    def record(name, timings):
+        if 'ops_per_sec' in timings['dict']:
+            timings['vs_dict'] = timings['hashTable']['ops_per_sec'] / timings['dict']['ops_per_sec']
+        results[name] = timings
+        if report is not None:
+            report(name, timings)
+
+    for size in sizes:
+        size = int(size)
+        repeats = max(3, min(50, operations // size)) # Whole-table operations
+        for kind in key_kinds:
+            keys = make_keys(kind, size, seed)
+            data = dict(zip(keys, keys))
+            record(f'memory/{kind}/{size}',
+                   {impl: {'bytes_per_entry': bytes_per_entry(build, data)} for impl, (_, build) in IMPLEMENTATIONS.items()})
+            tables = {impl: build(data) for impl, (_, build) in IMPLEMENTATIONS.items()}
+            others = {impl: build(data) for impl, (_, build) in IMPLEMENTATIONS.items()}
+            whole = {
+                'set': lambda impl: (_set, IMPLEMENTATIONS[impl][0], keys),
+                'len': lambda impl: (lambda table, _: len(table), tables[impl], range(operations)),
+                'iterate': lambda impl: (_iterate, tables[impl], range(repeats)),
+                'copy': lambda impl: (lambda table, _: table.copy(), tables[impl], range(repeats)),
+                'eq': lambda impl: (operator.eq, tables[impl], [others[impl]] * repeats),
+                'from_dict': lambda impl: (lambda _, source: IMPLEMENTATIONS[impl][1](source), None, [data] * repeats),
+            }
+            for operation, workload in whole.items():
+                record(f'{operation}/{kind}/{size}', {impl: _time(*workload(impl)) for impl in IMPLEMENTATIONS})
+            for access in accesses:
+                lookups = make_accesses(keys, access, operations, seed, zipf)
+                steps = list(zip(lookups, random.Random(seed).choices(range(3), weights=mix, k=operations)))
+                lookup = {
+                    'get': lambda impl: (operator.getitem, tables[impl], lookups),
+                    'contains': lambda impl: (operator.contains, tables[impl], lookups),
+                    'mixed': lambda impl: (_mixed, lambda: IMPLEMENTATIONS[impl][1](data), steps),
+                }
+                for operation, workload in lookup.items():
+                    record(f'{operation}/{kind}/{access}/{size}', {impl: _time(*workload(impl)) for impl in IMPLEMENTATIONS})
+    return {'python': platform.python_version(), 'operations': operations, 'mix': list(mix), 'seed': seed, 'results': results}
+
+def compare(baseline, current, threshold=0.1):
+    # hashTable results that got worse than baseline by more than threshold, as (name, metric, baseline, current)
+    regressions = []
+    for name, timings in current['results'].items():
+        before = baseline['results'].get(name, {}).get('hashTable')
+        if before is None:
+            continue
+        after = timings['hashTable']
+        if 'ops_per_sec' in after and after['ops_per_sec'] < before['ops_per_sec'] * (1 - threshold):
+            regressions.append((name, 'ops_per_sec', before['ops_per_sec'], after['ops_per_sec']))
+        if 'bytes_per_entry' in after and after['bytes_per_entry'] > before['bytes_per_entry'] * (1 + threshold):
+            regressions.append((name, 'bytes_per_entry', before['bytes_per_entry'], after['bytes_per_entry']))
+    return regressions
+
+def print_result(name, timings):
+    table, reference = timings['hashTable'], timings['dict']
+    if 'bytes_per_entry' in table:
+        print(f"{name:32} {table['bytes_per_entry']:12.1f} B/entry   dict {reference['bytes_per_entry']:10.1f} B/entry")
+    else:
+        print(f"{name:32} {table['ops_per_sec']:12,.0f} ops/sec   dict {reference['ops_per_sec']:14,.0f} ops/sec"
+              f"   x{timings['vs_dict']:.2f}   p50 {table['p50_ns']:,} ns   p99 {table['p99_ns']:,} ns")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark hashTable against dict')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run')
+    run_parser.add_argument('--sizes', nargs='+', type=lambda size: int(float(size)), default=DEFAULT_SIZES)
+    run_parser.add_argument('--keys', nargs='+', choices=KEY_KINDS, default=KEY_KINDS)
+    run_parser.add_argument('--access', nargs='+', choices=ACCESSES, default=ACCESSES)
+    run_parser.add_argument('--mix', nargs=3, type=float, default=DEFAULT_MIX, metavar=('GET', 'SET', 'DELETE'))
+    run_parser.add_argument('--operations', type=int, default=DEFAULT_OPERATIONS)
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--zipf', type=float, default=1.1)
+    run_parser.add_argument('--output')
+    compare_parser = commands.add_parser('compare')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run(args.sizes, args.keys, args.access, args.mix, args.operations, args.seed, args.zipf, print_result)
+        if args.output:
+            with open(args.output, 'w') as file:
+                json.dump(results, file, indent=2)
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+    regressions = compare(baseline, current, args.threshold)
+    for name, metric, before, after in regressions:
+        print(f'{name:32} {metric:16} {before:14,.1f} -> {after:14,.1f}')
+    print(f'{len(regressions)} regressions over {args.threshold:.0%}')
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,246 @@
+'''Bounded cache on top of hashTable
+
+- max_entries and/or max_bytes cap the cache, and an eviction policy picks what goes when
+  a write takes it over either limit: 'lru', 'lfu' and 'fifo' are built in, or pass any object
+  with insert/access/remove/victim methods
+- ttl (seconds) expires entries lazily: an expired entry is dropped the next time it's read,
+  or whenever the policy picks it for eviction
+- get_or_load(key, loader) calls loader once per missing key however many threads ask at once,
+  the rest wait for its result
+- hits, misses, evictions and expirations count what the cache has done
+
+Every operation is O(1): policies keep their own order instead of scanning the table.
+'''
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from hashtable import DEFAULT_LOAD_FACTOR, hashTable
+
+_DEFAULT = object() # "Use the cache's own ttl"
+
+def default_sizeof(key, value):
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+class LRUPolicy:
+    # Evicts whatever was used longest ago
+
+    def __init__(self):
+        self._order = OrderedDict()
+
+    def insert(self, key):
+        self._order[key] = None
+
+    def access(self, key):
+        self._order.move_to_end(key)
+
+    def remove(self, key):
+        del self._order[key]
+
+    def victim(self):
+        return next(iter(self._order))
+
+class FIFOPolicy(LRUPolicy):
+    # Evicts whatever was inserted first, reads and overwrites don't count
+
+    def access(self, key):
+        pass
+
+class LFUPolicy:
+    # Evicts whatever has been used least often, the least recently used of those on a tie.
+    # The use counts that have keys are linked in increasing order, so the least is always first.
+
+    def __init__(self):
+        self._counts = {}
+        self._buckets = {} # use count -> keys with that count, oldest first
+        self._next = {0: None} # use count -> next higher count with keys, 0 heads the list
+        self._prev = {}
+
+    def insert(self, key):
+        self._counts[key] = 1
+        self._link(1, 0)
+        self._buckets[1][key] = None
+
+    def access(self, key):
+        count = self._counts[key]
+        self._link(count + 1, count)
+        self._buckets[count + 1][key] = None
+        self._counts[key] = count + 1
+        self._unlink(key, count)
+
+    def remove(self, key):
+        self._unlink(key, self._counts.pop(key))
+
+    def victim(self):
+        return next(iter(self._buckets[self._next[0]]))
+
+    def _link(self, count, after):
+        # Gives count a bucket if it hasn't one, linked in straight after the bucket for after
+        if count in self._buckets:
+            return
+        self._buckets[count] = OrderedDict()
+        following = self._next[after]
+        self._next[after] = count
+        self._prev[count] = after
+        self._next[count] = following
+        if following is not None:
+            self._prev[following] = count
+
+    def _unlink(self, key, count):
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            before, following = self._prev.pop(count), self._next.pop(count)
+            self._next[before] = following
+            if following is not None:
+                self._prev[following] = before
+
+POLICIES = {'lru': LRUPolicy, 'lfu': LFUPolicy, 'fifo': FIFOPolicy}
+
+class _Load:
+    # A loader call other threads can wait on
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+class CacheHashTable(hashTable):
+
+    def __init__(self, max_capacity=8, max_load_factor=DEFAULT_LOAD_FACTOR, max_entries=None, max_bytes=None,
+                 policy='lru', ttl=None, sizeof=default_sizeof, clock=time.monotonic, hash_function=None):
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError('Max entries must be a positive number')
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError('Max bytes must be a positive number')
+        if max_entries is not None: # No point growing past the limit one insert at a time
+            max_capacity = max(max_capacity, int((max_entries + 1) / max_load_factor) + 1)
+        super().__init__(max_capacity, max_load_factor, hash_function)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.policy = POLICIES[policy]() if isinstance(policy, str) else policy
+        self._sizeof = sizeof
+        self._clock = clock
+        self._expires = {} # key -> deadline, only for keys with a ttl
+        self._sizes = {} # key -> bytes, only when max_bytes is set
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.RLock()
+        self._loading = {} # key -> _Load for loaders in flight
+
+    def __getitem__(self, key):
+        with self._lock:
+            hash_value = self._hash(key)
+            _, _, position = self._find(key, hash_value)
+            if position >= 0 and self._expired(key):
+                self._remove(key, hash_value)
+                self.expirations += 1
+                position = -1
+            if position < 0:
+                self.misses += 1
+                raise KeyError(key)
+            self.hits += 1
+            self.policy.access(key)
+            return self._values[position]
+
+    def __contains__(self, key):
+        # A membership check isn't a use, so it leaves the counters and eviction order alone
+        with self._lock:
+            _, _, position = self._find(key, self._hash(key))
+            return position >= 0 and not self._expired(key)
+
+    def __setitem__(self, key, pair):
+        self.set(key, pair)
+
+    def __delitem__(self, key):
+        with self._lock:
+            self._remove(key, self._hash(key))
+
+    def set(self, key, value, ttl=_DEFAULT):
+        with self._lock:
+            hash_value = self._hash(key)
+            _, _, position = self._find(key, hash_value)
+            self._set(key, hash_value, value)
+            if position >= 0:
+                self.policy.access(key)
+            else:
+                self.policy.insert(key)
+            ttl = self.ttl if ttl is _DEFAULT else ttl
+            if ttl is None:
+                self._expires.pop(key, None)
+            else:
+                self._expires[key] = self._clock() + ttl
+            if self.max_bytes is not None:
+                size = self._sizeof(key, value)
+                self.nbytes += size - self._sizes.get(key, 0)
+                self._sizes[key] = size
+            self._evict()
+
+    def get_many(self, keys, default=None):
+        # Through __getitem__, so expiry, the counters and the policy see every key
+        return [self.get(key, default) for key in keys]
+
+    def set_many(self, pairs):
+        for key, val in pairs:
+            self.set(key, val)
+
+    def update(self, other=(), **kwargs):
+        if hasattr(other, 'keys'):
+            other = [(key, other[key]) for key in other.keys()]
+        self.set_many(other)
+        self.set_many(kwargs.items())
+
+    def delete_many(self, keys):
+        for key in keys:
+            del self[key]
+
+    def get_or_load(self, key, loader, ttl=_DEFAULT):
+        try:
+            return self[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key in self: # Another caller's load finished between our miss and here
+                return self[key]
+            load = self._loading.get(key)
+            leader = load is None
+            if leader:
+                load = self._loading[key] = _Load()
+        if not leader: # Someone's already loading this key, share their result
+            load.done.wait()
+            if load.error is not None:
+                raise load.error
+            return load.value
+        try:
+            load.value = loader(key)
+            self.set(key, load.value, ttl)
+            return load.value
+        except BaseException as error:
+            load.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._loading[key]
+            load.done.set()
+
+    def _expired(self, key):
+        deadline = self._expires.get(key)
+        return deadline is not None and self._clock() >= deadline
+
+    def _remove(self, key, hash_value):
+        self._delete(key, hash_value)
+        self.policy.remove(key)
+        self._expires.pop(key, None)
+        self.nbytes -= self._sizes.pop(key, 0)
+
+    def _evict(self):
+        while ((self.max_entries is not None and len(self) > self.max_entries) or
+               (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+            key = self.policy.victim()
+            self._remove(key, self._hash(key))
+            self.evictions += 1
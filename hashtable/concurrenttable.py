@@ -0,0 +1,220 @@
+'''Thread-safe hashTable for serving lookups from a thread pool
+
+- Readers don't take locks. They read the table optimistically and check a version counter
+  (a seqlock) that writers bump before and after every change. A read that overlapped a write
+  is retried, and after OPTIMISTIC_RETRIES failed attempts it waits for the write lock instead.
+- Writers take one write lock, so they run one at a time. Every write appends to the shared
+  entry columns and may resize the index, so per-key lock stripes couldn't let them overlap.
+  setdefault/pop/compare_and_set do their read and write under the lock, which is what makes
+  them atomic.
+- compute_if_absent runs its function outside the lock, so slow loaders don't hold up other
+  writers and may write to the table themselves. Threads asking for a key that's already being
+  computed wait for that result instead of computing it again. A function mustn't
+  compute_if_absent its own key.
+- Resizes are ordinary writes, so readers racing one just retry.
+
+Iteration, keys(), values() and items() are weakly consistent, like the views of any table being
+written to. copy() and snapshot() take the write lock and are exact.
+
+Run this module to benchmark mixed read/write throughput across thread counts.
+'''
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from cachetable import _Load
+from hashtable import DEFAULT_LOAD_FACTOR, hashTable
+
+OPTIMISTIC_RETRIES = 8
+
+_MISSING = object()
+
+class ConcurrentHashTable(hashTable):
+
+    # Readers hash the key before they read, so switching hash functions under them could make a key they're
+    # after look missing: there's no automatic switch to a random hash here, pass hashing.random_hash() up front
+    def __init__(self, max_capacity, max_load_factor=DEFAULT_LOAD_FACTOR, hash_function=None):
+        super().__init__(max_capacity, max_load_factor, hash_function, max_probe=None)
+        # Reentrant, because batch methods like update() call other locked methods
+        self._write_lock = threading.RLock()
+        self._writers = 0 # Nesting depth of _writing() in the thread holding the write lock
+        self._version = 0 # Odd while a write is in progress
+        self._loading = {} # key -> _Load for compute_if_absent functions in flight
+
+    @contextmanager
+    def _writing(self):
+        with self._write_lock:
+            self._writers += 1
+            if self._writers == 1:
+                self._version += 1
+            try:
+                yield
+            finally:
+                self._writers -= 1
+                if self._writers == 0:
+                    self._version += 1
+
+    def _read_value(self, key, hash_value):
+        for _ in range(OPTIMISTIC_RETRIES):
+            version = self._version
+            if not version & 1:
+                try:
+                    _, _, position = self._find(key, hash_value)
+                    value = self._values[position] if position >= 0 else _MISSING
+                except (IndexError, TypeError): # Saw the columns or index half-way through a write
+                    pass
+                else:
+                    if self._version == version:
+                        return value
+            time.sleep(0) # Let the writer finish
+        with self._write_lock:
+            _, _, position = self._find(key, hash_value)
+            return self._values[position] if position >= 0 else _MISSING
+
+    def __getitem__(self, key):
+        value = self._read_value(key, self._hash(key))
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, pair):
+        hash_value = self._hash(key)
+        with self._writing():
+            self._set(key, hash_value, pair)
+
+    def __delitem__(self, key):
+        hash_value = self._hash(key)
+        with self._writing():
+            self._delete(key, hash_value)
+
+    def get_many(self, keys, default=None):
+        keys = keys if isinstance(keys, list) else list(keys)
+        results = []
+        for key, hash_value in zip(keys, self._hash_many(keys)):
+            value = self._read_value(key, hash_value)
+            results.append(default if value is _MISSING else value)
+        return results
+
+    def set_many(self, pairs):
+        with self._writing():
+            super().set_many(pairs)
+
+    def update(self, other=(), **kwargs):
+        with self._writing():
+            super().update(other, **kwargs)
+
+    def delete_many(self, keys):
+        with self._writing():
+            super().delete_many(keys)
+
+    # These only read, so they hold the write lock to keep writers out without bumping _version under lock-free readers
+    def snapshot(self):
+        with self._write_lock:
+            return super().snapshot()
+
+    def copy(self):
+        table = ConcurrentHashTable(self.capacity, self._max_load_factor, self._hash_function)
+        with self._write_lock:
+            table.update(super().copy()) # Reuses the stored hashes, nothing gets rehashed
+        return table
+
+    def _current(self, key, hash_value):
+        # Plain lookup for callers holding the write lock, where nothing can change under us
+        _, _, position = self._find(key, hash_value)
+        return self._values[position] if position >= 0 else _MISSING
+
+    def setdefault(self, key, default=None):
+        hash_value = self._hash(key)
+        with self._writing():
+            value = self._current(key, hash_value)
+            if value is _MISSING:
+                self._set(key, hash_value, default)
+                value = default
+            return value
+
+    def pop(self, key, default=_MISSING):
+        hash_value = self._hash(key)
+        with self._writing():
+            value = self._current(key, hash_value)
+            if value is _MISSING:
+                if default is _MISSING:
+                    raise KeyError(key)
+                return default
+            self._delete(key, hash_value)
+            return value
+
+    def compute_if_absent(self, key, function):
+        hash_value = self._hash(key)
+        value = self._read_value(key, hash_value)
+        if value is not _MISSING:
+            return value
+        with self._write_lock:
+            value = self._current(key, hash_value) # Another thread may have computed it while we waited
+            if value is not _MISSING:
+                return value
+            load = self._loading.get(key)
+            leader = load is None
+            if leader:
+                load = self._loading[key] = _Load()
+        if not leader: # Someone's already computing this key, share their result
+            load.done.wait()
+            if load.error is not None:
+                raise load.error
+            return load.value
+        try:
+            value = function(key) # Holding no lock, so function can use the table
+            with self._writing():
+                current = self._current(key, hash_value)
+                if current is _MISSING:
+                    self._set(key, hash_value, value)
+                else: # Set directly while function ran, which wins like it would have if it came first
+                    value = current
+            load.value = value
+            return value
+        except BaseException as error:
+            load.error = error
+            raise
+        finally:
+            with self._write_lock:
+                del self._loading[key]
+            load.done.set()
+
+    def compare_and_set(self, key, expected, value):
+        # Sets key to value only if it's currently expected, returns whether it did
+        hash_value = self._hash(key)
+        with self._writing():
+            current = self._current(key, hash_value)
+            if current is _MISSING or not (current is expected or current == expected):
+                return False
+            self._set(key, hash_value, value)
+            return True
+
+def benchmark(thread_counts=(1, 2, 4, 8), operations=200000, keys=10000, read_ratio=0.9):
+    # Ops/sec for a mixed read/write workload spread over each number of threads
+    results = {}
+    for threads in thread_counts:
+        table = ConcurrentHashTable.from_items((key, key) for key in range(keys))
+        rnd = random.Random(threads)
+        workloads = [[(rnd.randrange(keys), rnd.random() < read_ratio) for _ in range(operations // threads)]
+                     for _ in range(threads)]
+
+        def work(workload):
+            for key, is_read in workload:
+                if is_read:
+                    table.get(key)
+                else:
+                    table[key] = key
+
+        workers = [threading.Thread(target=work, args=(workload,)) for workload in workloads]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        results[threads] = (operations // threads) * threads / (time.perf_counter() - start)
+    return results
+
+if __name__ == '__main__':
+    for threads, ops_per_sec in benchmark().items():
+        print(f'{threads:3} threads {ops_per_sec:14,.0f} ops/sec')
@@ -0,0 +1,111 @@
+'''Hash functions for hashTable(hash_function=...) and plotting.distribute(hash_function=...)
+
+Each one agrees with == the way hash() does (1, 1.0, True, Decimal(1) and 1+0j hash alike) and
+returns a signed 64-bit int, so it fits the table's hash column.
+
+- splitmix64: hash() run through the SplitMix64 finaliser. Cheap, and it spreads out keys
+  hash() leaves in a pattern, like sequential or strided integer IDs (hash(n) == n for small ints)
+- fibonacci_hash: hash() times 2**64 / golden ratio, high bits folded into the low ones. Cheaper still
+- stable_hash: keyed BLAKE2b over the key's value, not its id or a per-process seed, so str, bytes,
+  numbers and tuples of them hash the same in every process. Other types fall back to scrambling
+  hash(), so they only agree with == among themselves: a key of your own type that == 1 won't
+  find the key 1. mmaptable and sharedtable match keys on the same encoding (encode_key) and
+  hash them with stable_hash_bytes, which gives the same value as stable_hash
+- keyed_hash(key): stable_hash with a secret key, random_hash(): the same with a random one.
+  hashTable switches to random_hash() by itself if probe lengths suggest hash flooding
+'''
+import numbers
+import os
+import struct
+from decimal import Decimal
+from fractions import Fraction
+from hashlib import blake2b
+
+_MASK = (1 << 64) - 1
+
+def _signed(value):
+    return value - (1 << 64) if value >> 63 else value
+
+def splitmix64(key):
+    z = (hash(key) + 0x9E3779B97F4A7C15) & _MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    return _signed(z ^ (z >> 31))
+
+def fibonacci_hash(key):
+    z = (hash(key) * 0x9E3779B97F4A7C15) & _MASK
+    return _signed(z ^ (z >> 32))
+
+def _int_bytes(number):
+    return number.to_bytes((number.bit_length() + 8) // 8, 'little', signed=True)
+
+def _encode_number(key):
+    # Every number that == an int encodes as that int, and every other finite real as its exact fraction
+    if isinstance(key, numbers.Complex) and not isinstance(key, numbers.Real):
+        if key.imag:
+            return b'c' + struct.pack('<dd', key.real, key.imag)
+        key = key.real
+    if isinstance(key, numbers.Integral): # bool and NumPy integers included
+        key = int(key)
+    else:
+        try:
+            key = Fraction(key) if isinstance(key, (float, Decimal, numbers.Rational)) else Fraction(float(key))
+        except (ValueError, OverflowError): # NaN and infinities
+            return b'f' + struct.pack('<d', float(key))
+        if key.denominator != 1:
+            numerator = _int_bytes(key.numerator)
+            return b'q' + len(numerator).to_bytes(8, 'little') + numerator + _int_bytes(key.denominator)
+        key = key.numerator
+    return b'i' + _int_bytes(key)
+
+def _encode(key):
+    # Bytes that are equal exactly when the keys are ==, or None for types we can't encode
+    if isinstance(key, str):
+        return b's' + key.encode('utf-8', 'surrogatepass')
+    if isinstance(key, bytes):
+        return b'b' + key
+    if isinstance(key, (numbers.Number, Decimal)):
+        try:
+            return _encode_number(key)
+        except (TypeError, ValueError): # A number type that won't convert, like a signalling NaN
+            return None
+    if isinstance(key, tuple):
+        parts = [b't']
+        for item in key:
+            encoded = _encode(item)
+            if encoded is None:
+                return None
+            parts.append(len(encoded).to_bytes(8, 'little') + encoded)
+        return b''.join(parts)
+    return None
+
+def encode_key(key):
+    # For keys that have to match by their bytes, like in a file: raises TypeError rather than fall back on hash()
+    encoded = _encode(key)
+    if encoded is None:
+        raise TypeError(f'Unsupported key type: {type(key).__name__!r}')
+    return encoded
+
+def stable_hash_bytes(encoded, key=b''):
+    # Hash of a key already run through encode_key
+    return int.from_bytes(blake2b(encoded, digest_size=8, key=key).digest(), 'little', signed=True)
+
+def keyed_hash(key=b''):
+    seed = int.from_bytes(blake2b(key, digest_size=8).digest(), 'little')
+
+    def hash_function(obj):
+        encoded = _encode(obj)
+        if encoded is None: # Not one of ours, so the best we can do is scramble hash()
+            return splitmix64(hash(obj) ^ seed)
+        return stable_hash_bytes(encoded, key)
+
+    hash_function.__name__ = 'keyed_hash'
+    return hash_function
+
+def random_hash():
+    hash_function = keyed_hash(os.urandom(16))
+    hash_function.__name__ = 'random_hash'
+    return hash_function
+
+stable_hash = keyed_hash()
+stable_hash.__name__ = 'stable_hash'
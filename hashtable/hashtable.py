@@ -3,43 +3,232 @@
 2. Retain insertion order
 3. Dynamically resize hash table
 4. Calculate load factor
+5. Pluggable hash functions (see hashing.py), switching to a randomized one if keys look like a hash flooding attack
+
+Layout (same idea as CPython's compact dict):
+- Entries live in dense, append-only columns (_hashes, _keys, _values) in insertion order
+- A sparse index array maps each slot to a position in those columns, or EMPTY/DUMMY
+- The index uses the smallest signed integer type that can hold a position for its capacity
 '''
-from multiprocessing.sharedctypes import Value
+from array import array
+from collections import Counter, deque
+from collections.abc import ItemsView, KeysView, Mapping, Set, ValuesView
+from itertools import islice
+from operator import length_hint
+from time import perf_counter
 from typing import NamedTuple, Any
 
+from hashing import random_hash
+
+DEFAULT_LOAD_FACTOR = 0.7
+MIGRATE_STEP = 8 # Entries moved into the new index per write while a resize is in progress
+BATCH_CHUNK = 16384 # Pairs set_many hashes and inserts at a time
+SLOW_LOOKUPS = 1000 # How many slow lookups profile() keeps by default
+FLOOD_PROBE_LIMIT = 512 # An insert probing this far means colliding keys, random keys at 1e6 entries stay under 150
+
+_EMPTY = -1 # Index slot that has never held an entry, probing stops here
+_DUMMY = -2 # Index slot whose entry was deleted, probing carries on past it
+
 class Pair(NamedTuple):
     key: Any
     value: Any
 #None = object() # To prevent allowing None pair to be used for hashTable object upon creation
 
+_DELETED = object() # Stands in for the key of a deleted entry until the columns are compacted
+_MISSING = object()
+
+class Change(NamedTuple):
+    # One difference yielded by hashTable.diff(), old or new is None when the key is only on one side
+    kind: str # 'added', 'removed' or 'changed'
+    key: Any
+    old: Any
+    new: Any
+
+class TableStats(NamedTuple):
+    length: int
+    capacity: int
+    load_factor: float
+    probe_lengths: Counter # probes needed to reach each live entry -> how many entries
+    max_probe: int
+    mean_probe: float
+    clusters: Counter # length of each run of occupied slots -> how many runs
+    tombstone_ratio: float # share of occupied slots that only hold a deleted entry
+    resizes: int
+    gets: int
+    sets: int
+    deletes: int
+    hash_calls: int
+
+class SlowLookup(NamedTuple):
+    key: Any
+    seconds: float
+    probes: int
+
+class _Profiler:
+    # Picks one lookup in every sample_every to time
+    def __init__(self, hook, threshold, sample_every):
+        self.hook = hook
+        self.threshold = threshold
+        self.sample_every = sample_every
+        self._countdown = sample_every
+
+    def sample(self):
+        self._countdown -= 1
+        if self._countdown:
+            return False
+        self._countdown = self.sample_every
+        return True
+
+_INDEX_TYPECODES = [(2 ** (8 * array(typecode).itemsize - 1) - 1, typecode) for typecode in 'bhiq']
+
+def _index_array(capacity):
+    # Positions are always below capacity, so pick the narrowest type that can hold capacity - 1
+    for limit, typecode in _INDEX_TYPECODES:
+        if capacity - 1 <= limit:
+            return array(typecode, [_EMPTY]) * capacity
+    raise OverflowError(f'Capacity {capacity} is too large for an index array')
+
+# Live views in the style of dict.keys()/values()/items(): they scan the entry columns as they iterate instead of copying them
+class hashTableKeys(KeysView):
+    def __iter__(self):
+        for key in self._mapping._keys:
+            if key is not _DELETED:
+                yield key
+
+class hashTableValues(ValuesView):
+    def __iter__(self):
+        for key, val in zip(self._mapping._keys, self._mapping._values):
+            if key is not _DELETED:
+                yield val
+
+    def __contains__(self, value):
+        for val in self:
+            if val is value or val == value:
+                return True
+        return False
+
+class hashTableItems(ItemsView):
+    def __iter__(self):
+        for key, val in zip(self._mapping._keys, self._mapping._values):
+            if key is not _DELETED:
+                yield key, val
+
 class hashTable:
 
     # Taking advantage of short-circuiting
     @classmethod
-    # If capacity isn't specified, we fall back to default behavior (multiply dictionary's len by 10)
-    def from_dict(cls, dictionary, capacity=None):
-        hash_table = cls(capacity or len(dictionary) * 10) # cls required to taek class dictionary as parameter
-        for key, val in dictionary.items():
-            hash_table[key] = val
+    # If capacity isn't specified, we size the table so the dictionary fits under the load factor
+    def from_dict(cls, dictionary, capacity=None, max_load_factor=DEFAULT_LOAD_FACTOR, hash_function=None):
+        return cls.from_items(dictionary.items(), capacity, max_load_factor, hash_function)
+
+    @classmethod
+    def from_items(cls, iterable, capacity=None, max_load_factor=DEFAULT_LOAD_FACTOR, hash_function=None):
+        # Sized from the length hint, then streamed in, so a big iterable is never copied into a list
+        capacity = capacity or int(length_hint(iterable) / max_load_factor) + 1
+        hash_table = cls(capacity, max_load_factor, hash_function=hash_function) # cls required to taek class dictionary as parameter
+        hash_table.set_many(iterable)
         return hash_table
 
-    def __init__(self, max_capacity):
+    # hashTable.open(path, 'w') builds a table that's saved to path on close, hashTable.open(path) maps it back read-only
+    @staticmethod
+    def open(path, mode='r'):
+        from mmaptable import open_table
+        return open_table(path, mode)
+
+    # hashTable(capacity, key_dtype='int64', value_dtype=...) hands back the NumPy backend instead
+    def __new__(cls, *args, key_dtype=None, value_dtype='int64', **kwargs):
+        if key_dtype is None:
+            return super().__new__(cls)
+        from arraytable import ArrayHashTable # Only needs NumPy installed when it's asked for
+        return ArrayHashTable(*args, key_dtype=key_dtype, value_dtype=value_dtype, **kwargs)
+
+    # hash_function defaults to hash(). Anything else must agree with == the way hash() does and return
+    # a signed 64-bit int. Unless max_probe is None, an insert that has to probe max_probe slots switches
+    # the table to hashing.random_hash() for good, which rehashes every key once.
+    def __init__(self, max_capacity, max_load_factor=DEFAULT_LOAD_FACTOR, hash_function=None, max_probe=FLOOD_PROBE_LIMIT):
         if max_capacity <= 0:
             raise ValueError('Max capacity must be a positive number')
-        self._pair = max_capacity * [None] # Quickesy way to populate list with given pair
+        if not 0 < max_load_factor < 1:
+            raise ValueError('Max load factor must be between 0 and 1')
+        self._indices = _index_array(max_capacity) # Sparse: slot -> position in the entry columns
+        self._hashes = array('q') # Dense: one entry per insertion, in insertion order
+        self._keys = []
+        self._values = []
+        self._max_load_factor = max_load_factor
+        self._hash_function = hash_function or hash
+        self._max_probe = max_probe # None once we've switched to a random hash, or if switching is off
+        self.hash_calls = 0 # Every hash() this table has made, lookups and resizes reuse stored hashes instead
+        self._len = 0 # Live entries
+        self._filled = 0 # Slots of self._indices that aren't EMPTY
+        self._resizes = 0
+        self._gets = 0
+        self._sets = 0
+        self._deletes = 0
+        self._profiler = None
+        self.slow_lookups = deque(maxlen=SLOW_LOOKUPS)
+        # Incremental resize state: entries before _end are still indexed by _old_indices until the
+        # migration reaches them. It walks the columns with _read, copies live entries down to _write
+        # and drops deleted ones, so the columns come out compacted and still in insertion order.
+        self._migrating = False
+        self._old_indices = None
+        self._read = 0
+        self._write = 0
+        self._end = 0
 
     def __len__(self):
-        return len(self.pair)
+        return self._len
 
     def __setitem__(self, key, pair):
-        # Keep max_capacity fixed
-        self._pair[self._index(key)] = Pair(key, pair)
+        self._set(key, self._hash(key), pair)
+
+    def _set(self, key, hash_value, pair):
+        self._sets += 1
+        slot, position = self._lookup(key, hash_value)
+        if position < 0 and self._old_indices is not None:
+            position = self._lookup_old(key, hash_value)[1]
+        if position >= 0: # Overwriting keeps the key's original place in insertion order
+            self._values[position] = pair
+            return
+        if self._used + 1 > self._usable:
+            if self._migrating: # Compacting the columns may free enough room on its own
+                self._migrate(len(self._hashes))
+            if self._used + 1 > self._usable:
+                self._resize()
+            slot, _ = self._lookup(key, hash_value)
+        if self._max_probe is not None:
+            capacity = len(self._indices)
+            if (slot - hash_value % capacity) % capacity >= self._max_probe:
+                self._rehash(random_hash())
+                hash_value = self._hash(key)
+                slot, _ = self._lookup(key, hash_value)
+        if self._indices[slot] == _EMPTY: # Reusing a DUMMY slot doesn't fill a new one
+            self._filled += 1
+        self._indices[slot] = len(self._hashes)
+        self._hashes.append(hash_value)
+        self._keys.append(key)
+        self._values.append(pair)
+        self._len += 1
+        self._migrate()
 
     def __getitem__(self, key):
-        pairs = self._pair[self._index(key)]
-        if pairs is None: # We use 'is' keyword t compare identity and not pair 
+        self._gets += 1
+        if self._profiler is not None and self._profiler.sample():
+            return self._profiled_get(key)
+        _, _, position = self._find(key, self._hash(key))
+        if position < 0:
+            raise KeyError(key)
+        return self._values[position]
+
+    def _profiled_get(self, key):
+        start = perf_counter()
+        hash_value = self._hash(key)
+        _, _, position = self._find(key, hash_value)
+        seconds = perf_counter() - start
+        if seconds >= self._profiler.threshold:
+            self._profiler.hook(SlowLookup(key, seconds, self._probe_count(key, hash_value)))
+        if position < 0:
             raise KeyError(key)
-        return pairs.value
+        return self._values[position]
 
     def __contains__(self, key):
         try:
@@ -50,53 +239,483 @@ class hashTable:
             return True
 
     def __delitem__(self, key):
-        # Taking advantage of mutator method
-        if key in self:
-            self._pair[self._index(key)] = None
-        else:
+        self._delete(key, self._hash(key))
+
+    def _delete(self, key, hash_value):
+        self._deletes += 1
+        indices, slot, position = self._find(key, hash_value)
+        if position < 0:
             raise KeyError(key)
+        indices[slot] = _DUMMY # Leaving EMPTY would cut off keys probed past this slot
+        self._keys[position] = _DELETED
+        self._values[position] = None
+        self._len -= 1
+        self._migrate()
 
     def __str__(self):
         pairs = []
-        for key, val in self.pair:
+        for key, val in self.items():
             pairs.append(f'{key!r}: {val!r}') #!r required for calling repr()
         return '{' + ', '.join(pairs) + '}'
 
     # Required to iterate through class instance (must return iterator object)
     def __iter__(self):
-        yield from self.keys # Yeild is needed to define our in-place iterator object
+        for key in self._keys: # Yeild is needed to define our in-place iterator object
+            if key is not _DELETED:
+                yield key
 
     def __repr__(self):
         cls = self.__class__.__name__ # Avoiding hard-coded name incase class needs to be renamed
         return f'{cls}.from_dict({str(self)})'
-    
+
     # So hash table is equal to itself, its copy, or another instance with same k/v pairs
     def __eq__(self, other_table):
         if self is other_table:
             return True
         if type(self) is not type(other_table):
             return False
-        return set(self.pair) == set(other_table.pair)
-    
-    # Don't remove otherwise copies may just be references to same object vs. their own object
-    @property
+        if len(self) != len(other_table):
+            return False
+        # Look each entry up in the other table by its stored hash instead of building sets of pairs,
+        # unless the tables hash differently and it has to hash the key itself
+        values = other_table._values
+        same_hash = other_table._hash_function is self._hash_function
+        for hash_value, key, val in zip(self._hashes, self._keys, self._values):
+            if key is _DELETED:
+                continue
+            _, _, position = other_table._find(key, hash_value if same_hash else other_table._hash(key))
+            if position < 0:
+                return False
+            other_val = values[position]
+            if not (other_val is val or other_val == val):
+                return False
+        return True
+
+    # Merges like dict's: the right-hand side's values win, and keys keep their first place in insertion order
+    def __or__(self, other):
+        if not isinstance(other, (hashTable, Mapping)):
+            return NotImplemented
+        table = self.copy()
+        table.update(other)
+        return table
+
+    def __ror__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        table = hashTable.from_dict(other, max_load_factor=self._max_load_factor, hash_function=self._hash_function)
+        table.update(self)
+        return table
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    # Key intersection and difference against another table, a mapping or a set, keeping this table's values
+    def __and__(self, other):
+        if not isinstance(other, (hashTable, Mapping, Set)):
+            return NotImplemented
+        return self._select(other, True)
+
+    def __sub__(self, other):
+        if not isinstance(other, (hashTable, Mapping, Set)):
+            return NotImplemented
+        return self._select(other, False)
+
+    def _getter(self, other):
+        # (key, hash from our column) -> other's value for key, or _MISSING. Reuses the hash when other hashes the same way.
+        if isinstance(other, hashTable):
+            values = other._values
+            if other._hash_function is self._hash_function:
+                find = other._find
+            else:
+                find = lambda key, _: other._find(key, other._hash(key))
+            def get(key, hash_value):
+                position = find(key, hash_value)[2]
+                return values[position] if position >= 0 else _MISSING
+            return get
+        if isinstance(other, Set):
+            return lambda key, _: key if key in other else _MISSING
+        return lambda key, _: other.get(key, _MISSING)
+
+    def _select(self, other, keep):
+        # New table of our entries whose keys are (keep=True) or aren't in other, built from our stored hashes
+        get = self._getter(other)
+        live = [(hash_value, key, val) for hash_value, key, val in zip(self._hashes, self._keys, self._values)
+                if key is not _DELETED and (get(key, hash_value) is not _MISSING) is keep]
+        table = hashTable(int(len(live) / self._max_load_factor) + 1, self._max_load_factor, self._hash_function, self._max_probe)
+        table._sets += len(live)
+        table._reserve(len(live))
+        table._insert_many([hash_value for hash_value, _, _ in live], [(key, val) for _, key, val in live])
+        return table
+
+    def diff(self, other):
+        # Streams what changed going from this table to other (another table or a mapping): removed and changed
+        # entries in our insertion order, then added ones in other's. Nothing is copied, so don't modify either mid-way.
+        get = self._getter(other)
+        for hash_value, key, val in zip(self._hashes, self._keys, self._values):
+            if key is _DELETED:
+                continue
+            other_val = get(key, hash_value)
+            if other_val is _MISSING:
+                yield Change('removed', key, val, None)
+            elif not (other_val is val or other_val == val):
+                yield Change('changed', key, val, other_val)
+        if isinstance(other, hashTable):
+            find = self._find if other._hash_function is self._hash_function else lambda key, _: self._find(key, self._hash(key))
+            for hash_value, key, val in zip(other._hashes, other._keys, other._values):
+                if key is not _DELETED and find(key, hash_value)[2] < 0:
+                    yield Change('added', key, None, val)
+        else:
+            for key, val in other.items():
+                if key not in self:
+                    yield Change('added', key, None, val)
+
+    def keys(self):
+        return hashTableKeys(self)
+
     def values(self):
-        return [val_pair.value for val_pair in self.pair]
-    
+        return hashTableValues(self)
+
+    def items(self):
+        return hashTableItems(self)
+
+    # Don't remove otherwise copies may just be references to same object vs. their own object
+    def snapshot(self):
+        return dict(self.items())
+
     @property
     def pair(self):
-        return {val_pair for val_pair in self._pair if val_pair} # creates separate list (needed to create different object from copy)
-    
-    @property
-    def keys(self):
-        return {val_pair.key for val_pair in self.pair} # Ensure no keys are same name
-    
+        return {Pair(key, val) for key, val in self.items()} # creates separate set (needed to create different object from copy)
+
     @property
     def capacity(self):
-        return len(self._pair)
+        return len(self._indices)
+
+    @property
+    def load_factor(self):
+        return self._len / self.capacity
+
+    @property
+    def _usable(self):
+        # Always leave at least one EMPTY slot so a probe for a missing key terminates
+        return min(int(self.capacity * self._max_load_factor), self.capacity - 1)
+
+    @property
+    def _used(self):
+        # What counts against _usable. Like CPython's dk_usable that's every entry appended to the columns, deleted
+        # or not, because reusing a DUMMY slot still appends one. Only a resize compacts them away.
+        return max(len(self._hashes), self._filled)
+
+    def stats(self):
+        # Walks the whole index, so this is for diagnostics rather than hot paths
+        probe_lengths = Counter()
+        indices_to_scan = [(self._indices, 0)]
+        if self._old_indices is not None: # Entries the migration hasn't reached yet are only in here
+            indices_to_scan.append((self._old_indices, self._read))
+        for indices, first_valid in indices_to_scan:
+            capacity = len(indices)
+            for slot, position in enumerate(indices):
+                if position >= first_valid: # Skips EMPTY and DUMMY too, they're negative
+                    probe_lengths[(slot - self._hashes[position] % capacity) % capacity + 1] += 1
+        clusters = Counter()
+        indices = self._indices
+        capacity = len(indices)
+        start = indices.index(_EMPTY) # Start just after an EMPTY slot so a run wrapping past the end counts once
+        run = 0
+        for offset in range(1, capacity + 1):
+            if indices[(start + offset) % capacity] == _EMPTY:
+                if run:
+                    clusters[run] += 1
+                run = 0
+            else:
+                run += 1
+        live = sum(probe_lengths.values())
+        return TableStats(
+            length=self._len,
+            capacity=capacity,
+            load_factor=self.load_factor,
+            probe_lengths=probe_lengths,
+            max_probe=max(probe_lengths, default=0),
+            mean_probe=sum(probes * count for probes, count in probe_lengths.items()) / live if live else 0.0,
+            clusters=clusters,
+            tombstone_ratio=self._indices.count(_DUMMY) / self._filled if self._filled else 0.0,
+            resizes=self._resizes,
+            gets=self._gets,
+            sets=self._sets,
+            deletes=self._deletes,
+            hash_calls=self.hash_calls,
+        )
+
+    # Opt-in sampling profiler: times one lookup in every sample_every, and hands any that took threshold
+    # seconds or more to hook as a SlowLookup (by default they're kept in self.slow_lookups)
+    def profile(self, hook=None, threshold=0.0, sample_every=100):
+        self._profiler = _Profiler(hook or self.slow_lookups.append, threshold, sample_every)
+
+    def stop_profiling(self):
+        self._profiler = None
+
+    @property
+    def hash_function(self):
+        return self._hash_function
+
+    def _hash(self, key):
+        self.hash_calls += 1
+        return self._hash_function(key)
+
+    def _hash_many(self, keys):
+        self.hash_calls += len(keys)
+        return list(map(self._hash_function, keys))
+
+    def _rehash(self, hash_function):
+        # Switch hash functions for good: finish any migration, then hash every live key again into a fresh index
+        if self._migrating:
+            self._migrate(len(self._hashes))
+        live = [(key, val) for key, val in zip(self._keys, self._values) if key is not _DELETED]
+        self._hash_function = hash_function
+        self._max_probe = None
+        self._indices = _index_array(self.capacity)
+        self._hashes = array('q')
+        self._keys = []
+        self._values = []
+        self._filled = self._len = 0
+        self._insert_many(self._hash_many([key for key, _ in live]), live)
+
+    def _lookup(self, key, hash_value):
+        # Linear probing: returns (slot, position) of key, or else (first free slot on its probe path, EMPTY)
+        indices = self._indices
+        hashes = self._hashes
+        keys = self._keys
+        capacity = len(indices)
+        slot = hash_value % capacity
+        free = -1
+        while True:
+            position = indices[slot]
+            if position == _EMPTY:
+                return (slot if free < 0 else free), _EMPTY
+            if position == _DUMMY:
+                if free < 0:
+                    free = slot
+            elif hashes[position] == hash_value: # Cheap check first, only call __eq__ on a hash match
+                stored = keys[position]
+                if stored is key or stored == key:
+                    return slot, position
+            slot += 1
+            if slot == capacity:
+                slot = 0
+
+    def _lookup_old(self, key, hash_value):
+        # Same probe over the index being drained, where positions the migration has passed are stale
+        indices = self._old_indices
+        hashes = self._hashes
+        keys = self._keys
+        read = self._read
+        capacity = len(indices)
+        slot = hash_value % capacity
+        while True:
+            position = indices[slot]
+            if position == _EMPTY:
+                return slot, _EMPTY
+            if position >= read and hashes[position] == hash_value:
+                stored = keys[position]
+                if stored is key or stored == key:
+                    return slot, position
+            slot += 1
+            if slot == capacity:
+                slot = 0
+
+    def _probe_count(self, key, hash_value):
+        # Slots a lookup of key inspects, up to where it finds key or an EMPTY slot stops it. Walks the probe
+        # path again rather than slow down _lookup, which is fine for the few lookups the profiler reports.
+        hashes = self._hashes
+        keys = self._keys
+        probes = 0
+        for indices, first_valid in ((self._indices, 0), (self._old_indices, self._read)):
+            if indices is None:
+                break
+            capacity = len(indices)
+            slot = hash_value % capacity
+            while True:
+                probes += 1
+                position = indices[slot]
+                if position == _EMPTY:
+                    break
+                if position >= first_valid and hashes[position] == hash_value:
+                    stored = keys[position]
+                    if stored is key or stored == key:
+                        return probes
+                slot += 1
+                if slot == capacity:
+                    slot = 0
+        return probes
+
+    def _find(self, key, hash_value):
+        # Returns (index array, slot, position), position is EMPTY when key is missing
+        slot, position = self._lookup(key, hash_value)
+        if position < 0 and self._old_indices is not None:
+            old_slot, position = self._lookup_old(key, hash_value)
+            return self._old_indices, old_slot, position
+        return self._indices, slot, position
+
+    def _slot_of(self, hash_value, position):
+        # Slot in the current index that points at position
+        indices = self._indices
+        capacity = len(indices)
+        slot = hash_value % capacity
+        while indices[slot] != position:
+            slot += 1
+            if slot == capacity:
+                slot = 0
+        return slot
+
+    def _resize(self, capacity=None):
+        # Swap in a new index now, but only move entries into it a few at a time on later writes
+        if self._migrating:
+            self._migrate(len(self._hashes))
+        # Room for the live entries twice over, so the migration finishes before the next resize
+        capacity = max(self.capacity, capacity or int(2 * (self._len + 1) / self._max_load_factor) + 1)
+        self._resizes += 1
+        self._old_indices = self._indices
+        self._indices = _index_array(capacity)
+        self._filled = 0
+        self._migrating = True
+        self._read = self._write = 0
+        self._end = len(self._hashes)
+
+    def _migrate(self, steps=MIGRATE_STEP):
+        if not self._migrating:
+            return
+        indices = self._indices
+        hashes = self._hashes
+        keys = self._keys
+        values = self._values
+        read, write, end = self._read, self._write, self._end
+        stop = min(read + steps, len(hashes))
+        while read < stop:
+            key = keys[read]
+            if key is not _DELETED:
+                hash_value = hashes[read]
+                if read < end: # Only the old index knows about it so far
+                    slot, _ = self._lookup(key, hash_value)
+                    if indices[slot] == _EMPTY:
+                        self._filled += 1
+                else: # Inserted since the resize began, the new index already points at read
+                    slot = self._slot_of(hash_value, read)
+                indices[slot] = write
+                if write != read:
+                    hashes[write] = hash_value
+                    keys[write] = key
+                    values[write] = values[read]
+                    keys[read] = _DELETED
+                    values[read] = None
+                write += 1
+            read += 1
+        self._read, self._write = read, write
+        if read >= end:
+            self._old_indices = None
+        if read == len(hashes):
+            del hashes[write:]
+            del keys[write:]
+            del values[write:]
+            self._migrating = False
+
+    def _reserve(self, count):
+        # Make room for count new entries up front, so a batch never resizes part way through
+        if self._migrating:
+            self._migrate(len(self._hashes))
+        if self._used + count > self._usable:
+            # At least double, so a stream reserving one chunk at a time still grows geometrically
+            self._resize(int((self._len + max(count, self._len)) / self._max_load_factor) + 1)
+            self._migrate(len(self._hashes))
+
+    def _insert_many(self, hash_values, items):
+        # Bulk insert with everything bound to locals, assumes _reserve(len(items)) has been called
+        lookup = self._lookup
+        indices = self._indices
+        hashes = self._hashes
+        keys = self._keys
+        values = self._values
+        filled = self._filled
+        capacity = len(indices)
+        max_probe = self._max_probe
+        added = 0
+        flooded = -1
+        for number, (hash_value, (key, val)) in enumerate(zip(hash_values, items)):
+            slot, position = lookup(key, hash_value)
+            if position >= 0:
+                values[position] = val
+                continue
+            if max_probe is not None and (slot - hash_value % capacity) % capacity >= max_probe:
+                flooded = number
+                break
+            if indices[slot] == _EMPTY:
+                filled += 1
+            indices[slot] = len(hashes)
+            hashes.append(hash_value)
+            keys.append(key)
+            values.append(val)
+            added += 1
+        self._filled = filled
+        self._len += added
+        if flooded >= 0: # Rehashing keeps the capacity and drops deleted entries, so the rest still fit
+            rest = items[flooded:]
+            self._rehash(random_hash())
+            self._insert_many(self._hash_many([key for key, _ in rest]), rest)
+
+    def set_many(self, pairs):
+        # Reserves for the length hint up front, then hashes and inserts BATCH_CHUNK pairs at a time
+        self._reserve(length_hint(pairs))
+        iterator = iter(pairs)
+        while True:
+            items = list(islice(iterator, BATCH_CHUNK))
+            if not items:
+                break
+            self._sets += len(items)
+            self._reserve(len(items))
+            self._insert_many(self._hash_many([key for key, _ in items]), items)
+
+    def update(self, other=(), **kwargs):
+        if isinstance(other, hashTable) and other._hash_function is self._hash_function: # Its stored hashes are good for us too
+            live = [(hash_value, key, val) for hash_value, key, val in zip(other._hashes, other._keys, other._values) if key is not _DELETED]
+            self._sets += len(live)
+            self._reserve(len(live))
+            self._insert_many([hash_value for hash_value, _, _ in live], [(key, val) for _, key, val in live])
+        elif hasattr(other, 'keys'): # Same rule as dict.update() for telling mappings apart from pairs
+            self.set_many([(key, other[key]) for key in other.keys()])
+        else:
+            self.set_many(other)
+        if kwargs:
+            self.set_many(kwargs.items())
+
+    def get_many(self, keys, default=None):
+        keys = keys if isinstance(keys, list) else list(keys)
+        self._gets += len(keys)
+        find = self._find
+        values = self._values
+        results = []
+        for key, hash_value in zip(keys, self._hash_many(keys)):
+            _, _, position = find(key, hash_value)
+            results.append(values[position] if position >= 0 else default)
+        return results
 
-    def _index(self, key):
-        return hash(key) % self.capacity
+    def delete_many(self, keys):
+        # All or nothing like ArrayHashTable's: every key is found before any is deleted, and repeats count once
+        keys = keys if isinstance(keys, list) else list(keys)
+        find = self._find
+        found = {}
+        for key, hash_value in zip(keys, self._hash_many(keys)):
+            indices, slot, position = find(key, hash_value)
+            if position < 0:
+                raise KeyError(key)
+            found[position] = indices, slot
+        table_keys = self._keys
+        values = self._values
+        for position, (indices, slot) in found.items():
+            indices[slot] = _DUMMY
+            table_keys[position] = _DELETED
+            values[position] = None
+        self._len -= len(found)
+        self._deletes += len(found)
+        self._migrate(MIGRATE_STEP * len(found))
 
     def get(self, key, default=None):
         try:
@@ -105,5 +724,24 @@ class hashTable:
             return default
 
     def copy(self):
-        return hashTable.from_dict(dict(self.pair), self.capacity)
-    
\ No newline at end of file
+        # Clone the columns and index as they stand, so no key gets hashed again
+        table = hashTable.__new__(hashTable)
+        table._indices = self._indices[:]
+        table._hashes = self._hashes[:]
+        table._keys = self._keys[:]
+        table._values = self._values[:]
+        table._max_load_factor = self._max_load_factor
+        table._hash_function = self._hash_function
+        table._max_probe = self._max_probe
+        table.hash_calls = 0
+        table._len = self._len
+        table._filled = self._filled
+        table._resizes = table._gets = table._sets = table._deletes = 0
+        table._profiler = None
+        table.slow_lookups = deque(maxlen=SLOW_LOOKUPS)
+        table._migrating = self._migrating
+        table._old_indices = None if self._old_indices is None else self._old_indices[:]
+        table._read = self._read
+        table._write = self._write
+        table._end = self._end
+        return table
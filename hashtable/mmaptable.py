@@ -0,0 +1,267 @@
+'''File-backed hashTable: hashTable.open(path, 'w') to build, hashTable.open(path) to serve
+
+On-disk layout (little-endian, every region starts on an 8-byte boundary):
+
+    header   64 bytes   magic b'HTBL', version, index itemsize, capacity, entry count,
+                        and the offset of the index, entry and heap regions plus the heap size
+    index    capacity x (1, 2, 4 or 8 bytes)
+                        slot -> entry number, -1 for an empty slot (same sizing rule as hashTable)
+    entries  count x 6 int64
+                        stable hash, key offset, encoded key length, pickled key length,
+                        value offset, value length
+    heap     each key encoded then pickled, and each pickled value. Offsets above are relative
+             to the start of the heap, and the pickled key follows straight after the encoded one
+
+A read-only open maps the file and probes the index in place, so there's no load step and
+every process that opens the same file shares its pages through the page cache. Only the
+keys being returned and the value being returned are ever unpickled.
+
+Python's hash() is seeded per process, so keys are encoded by value with hashing.encode_key and
+hashed with hashing.stable_hash_bytes, and keys match by their encoded bytes. Equal keys encode
+the same way (1, 1.0 and True are one key, like in a dict), but only str, bytes, numbers and
+tuples of them can be encoded: dump() raises TypeError for any other key.
+
+Opening a file unpickles its keys and values, which can run arbitrary code, so only open
+files you trust.
+'''
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+from operator import length_hint
+from hashing import encode_key, stable_hash_bytes
+from hashtable import _INDEX_TYPECODES, DEFAULT_LOAD_FACTOR, _index_array, hashTable
+
+MAGIC = b'HTBL'
+VERSION = 2
+PICKLE_PROTOCOL = 4
+
+_HEADER = struct.Struct('<4sII6Q')
+_HEADER_SIZE = 64
+_ENTRY_FIELDS = 6
+_TYPECODES = {array(typecode).itemsize: typecode for _, typecode in _INDEX_TYPECODES}
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+def dump(table, path, max_load_factor=DEFAULT_LOAD_FACTOR):
+    # Written to a temporary file and renamed, so readers of the old file keep a consistent view
+    capacity = int(len(table) / max_load_factor) + 1
+    indices = _index_array(capacity)
+    entries = array('q')
+    heap = bytearray()
+    for number, (key, val) in enumerate(table.items()):
+        key_bytes = encode_key(key)
+        pickled_key = pickle.dumps(key, PICKLE_PROTOCOL)
+        val_bytes = pickle.dumps(val, PICKLE_PROTOCOL)
+        hash_value = stable_hash_bytes(key_bytes)
+        slot = hash_value % capacity
+        while indices[slot] != -1:
+            slot += 1
+            if slot == capacity:
+                slot = 0
+        indices[slot] = number
+        val_offset = len(heap) + len(key_bytes) + len(pickled_key)
+        entries.extend((hash_value, len(heap), len(key_bytes), len(pickled_key), val_offset, len(val_bytes)))
+        heap += key_bytes
+        heap += pickled_key
+        heap += val_bytes
+    if sys.byteorder != 'little':
+        indices.byteswap()
+        entries.byteswap()
+    index_offset = _HEADER_SIZE
+    entries_offset = _align(index_offset + len(indices) * indices.itemsize)
+    heap_offset = entries_offset + len(entries) * entries.itemsize
+    header = _HEADER.pack(MAGIC, VERSION, indices.itemsize, capacity, len(entries) // _ENTRY_FIELDS,
+                          index_offset, entries_offset, heap_offset, len(heap))
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(header.ljust(_HEADER_SIZE, b'\0'))
+        file.write(indices.tobytes().ljust(entries_offset - index_offset, b'\0'))
+        file.write(entries.tobytes())
+        file.write(heap)
+    os.replace(temporary, path)
+
+def open_table(path, mode='r'):
+    if mode == 'r':
+        return MappedHashTable(path)
+    if mode == 'w':
+        return FileHashTable(path)
+    raise ValueError(f"Mode must be 'r' or 'w', not {mode!r}")
+
+class FileHashTable(hashTable):
+    # An ordinary in-memory hashTable that writes itself to path on close()
+
+    # Same as hashTable's, with the path to save to first
+    @classmethod
+    def from_dict(cls, path, dictionary, capacity=None, max_load_factor=DEFAULT_LOAD_FACTOR, hash_function=None):
+        return cls.from_items(path, dictionary.items(), capacity, max_load_factor, hash_function)
+
+    @classmethod
+    def from_items(cls, path, iterable, capacity=None, max_load_factor=DEFAULT_LOAD_FACTOR, hash_function=None):
+        capacity = capacity or int(length_hint(iterable) / max_load_factor) + 1
+        table = cls(path, capacity, max_load_factor, hash_function)
+        table.set_many(iterable)
+        return table
+
+    def __init__(self, path, max_capacity=8, max_load_factor=DEFAULT_LOAD_FACTOR, hash_function=None):
+        super().__init__(max_capacity, max_load_factor, hash_function)
+        self.path = path
+
+    # Keys dump() can't encode are refused as they're written, instead of failing the whole build at close()
+    def __setitem__(self, key, pair):
+        encode_key(key)
+        super().__setitem__(key, pair)
+
+    def set_many(self, pairs):
+        self._reserve(length_hint(pairs)) # The checking generator below hides the hint
+        super().set_many(self._checked(pairs))
+
+    def update(self, other=(), **kwargs):
+        if isinstance(other, hashTable):
+            for key in other:
+                encode_key(key)
+        super().update(other, **kwargs)
+
+    @staticmethod
+    def _checked(pairs):
+        for key, val in pairs:
+            encode_key(key)
+            yield key, val
+
+    def flush(self):
+        dump(self, self.path, self._max_load_factor)
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is None: # Don't replace a good file with a half-built table
+            self.close()
+
+class MappedHashTable:
+    # Read-only view of a file written by dump(), served straight out of the page cache
+
+    def __init__(self, path):
+        if sys.byteorder != 'little':
+            raise OSError('Mapped hash tables are only supported on little-endian machines')
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        try:
+            magic, version, itemsize, capacity, count, index_offset, entries_offset, heap_offset, heap_size = _HEADER.unpack_from(view)
+        except struct.error:
+            magic = None
+        if magic != MAGIC or version != VERSION:
+            view.release()
+            self._mmap.close()
+            raise ValueError(f'{path!r} is not a version {VERSION} hash table file')
+        self._view = view
+        self._indices = view[index_offset:index_offset + capacity * itemsize].cast(_TYPECODES[itemsize])
+        self._entries = view[entries_offset:entries_offset + count * _ENTRY_FIELDS * 8].cast('q')
+        self._heap = view[heap_offset:heap_offset + heap_size]
+        self._len = count
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, key):
+        position = self._find(key)
+        if position < 0:
+            raise KeyError(key)
+        _, _, _, _, val_offset, val_length = self._entry(position)
+        return pickle.loads(self._heap[val_offset:val_offset + val_length])
+
+    def __contains__(self, key):
+        return self._find(key) >= 0
+
+    def __iter__(self):
+        for position in range(self._len):
+            yield self._key(self._entry(position))
+
+    def __str__(self):
+        pairs = [f'{key!r}: {val!r}' for key, val in self.items()]
+        return '{' + ', '.join(pairs) + '}'
+
+    def __repr__(self):
+        cls = self.__class__.__name__
+        return f'{cls}({self.path!r})'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def capacity(self):
+        return len(self._indices)
+
+    @property
+    def load_factor(self):
+        return self._len / self.capacity
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        heap = self._heap
+        return [pickle.loads(heap[entry[4]:entry[4] + entry[5]]) for entry in map(self._entry, range(self._len))]
+
+    def items(self):
+        heap = self._heap
+        return [(self._key(entry), pickle.loads(heap[entry[4]:entry[4] + entry[5]])) for entry in map(self._entry, range(self._len))]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def copy(self):
+        # Loads the file into an ordinary, writable hashTable
+        return hashTable.from_items(self.items())
+
+    def close(self):
+        for view in (self._indices, self._entries, self._heap, self._view):
+            view.release()
+        self._mmap.close()
+
+    def _entry(self, position):
+        start = position * _ENTRY_FIELDS
+        return self._entries[start:start + _ENTRY_FIELDS].tolist()
+
+    def _key(self, entry):
+        _, key_offset, key_length, pickled_length, _, _ = entry
+        return pickle.loads(self._heap[key_offset + key_length:key_offset + key_length + pickled_length])
+
+    def _find(self, key):
+        # Entry number for key, -1 if it isn't there. Compares stored hashes before touching the heap.
+        try:
+            key_bytes = encode_key(key)
+        except TypeError: # dump() wouldn't have written it
+            return -1
+        indices = self._indices
+        entries = self._entries
+        heap = self._heap
+        hash_value = stable_hash_bytes(key_bytes)
+        capacity = len(indices)
+        slot = hash_value % capacity
+        while True:
+            position = indices[slot]
+            if position < 0:
+                return -1
+            start = position * _ENTRY_FIELDS
+            if entries[start] == hash_value:
+                key_offset = entries[start + 1]
+                if entries[start + 2] == len(key_bytes) and heap[key_offset:key_offset + len(key_bytes)] == key_bytes:
+                    return position
+            slot += 1
+            if slot == capacity:
+                slot = 0
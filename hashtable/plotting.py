@@ -4,8 +4,62 @@ from string import printable
 def distribute(items, num_containers, hash_function=hash):
     return Counter([hash_function(item) % num_containers for item in items])
 
-def plot(histogram):
+def plot(histogram, width=None):
+    # width scales the longest bar to that many characters, for histograms with big counts
+    if not histogram:
+        return
+    longest = max(histogram.values())
     for key in sorted(histogram):
         count = histogram[key]
-        padding = (max(histogram.values()) - count) * " "
-        print(f"{key:3} {'■' * count}{padding} ({count})")
+        bar = count if width is None else round(count * width / longest)
+        padding = ((longest if width is None else width) - bar) * " "
+        print(f"{key:3} {'■' * bar}{padding} ({count})")
+
+def probe_lengths(items, capacity, hash_function=hash):
+    # Linear-probe the distinct items into capacity slots the way hashTable does, and count how far each went
+    occupied = [False] * capacity
+    lengths = Counter()
+    for item in dict.fromkeys(items):
+        slot = hash_function(item) % capacity
+        probes = 1
+        while occupied[slot]:
+            slot = (slot + 1) % capacity
+            probes += 1
+        occupied[slot] = True
+        lengths[probes] += 1
+    return lengths
+
+def compare(items, hash_functions, load_factor=0.7):
+    # How each hash function would do on a real key set (a list, or a table's keys()) at load_factor
+    items = list(dict.fromkeys(items))
+    capacity = int(len(items) / load_factor) + 1
+    if not isinstance(hash_functions, dict):
+        hash_functions = {hash_function.__name__: hash_function for hash_function in hash_functions}
+    results = {}
+    for name, hash_function in hash_functions.items():
+        lengths = probe_lengths(items, capacity, hash_function)
+        buckets = distribute(items, capacity, hash_function)
+        results[name] = {
+            'mean_probe': sum(probes * count for probes, count in lengths.items()) / max(len(items), 1),
+            'max_probe': max(lengths, default=0),
+            'collisions': len(items) - len(buckets),
+            'largest_bucket': max(buckets.values(), default=0),
+        }
+    return results
+
+def plot_comparison(results):
+    print(f"{'hash function':20} {'mean probe':>10} {'max probe':>10} {'collisions':>10} {'largest bucket':>15}")
+    for name, result in results.items():
+        print(f"{name:20} {result['mean_probe']:10.2f} {result['max_probe']:10} {result['collisions']:10} {result['largest_bucket']:15}")
+
+def plot_stats(stats, width=50):
+    # Renders hashTable.stats()
+    print(f"length {stats.length}, capacity {stats.capacity}, load factor {stats.load_factor:.2f}")
+    print(f"probes: mean {stats.mean_probe:.2f}, max {stats.max_probe}; tombstones {stats.tombstone_ratio:.1%} of occupied slots")
+    print(f"resizes {stats.resizes}, gets {stats.gets}, sets {stats.sets}, deletes {stats.deletes}, hash calls {stats.hash_calls}")
+    if stats.probe_lengths:
+        print("probe lengths")
+        plot(stats.probe_lengths, width)
+    if stats.clusters:
+        print("cluster sizes")
+        plot(stats.clusters, width)
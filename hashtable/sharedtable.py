@@ -0,0 +1,315 @@
+'''hashTable in shared memory, built once and read by a whole multiprocessing worker pool
+
+One process creates the table (SharedHashTable.create or from_items) and hands its name to
+the workers, which SharedHashTable.attach(name) to it. Lookups probe the shared block in
+place, so attaching costs nothing and there's one copy of the table however many workers.
+
+Layout of the block (native int64 words, little-endian on every platform we run on):
+
+    header   8 words    magic/version, capacity, max entries, heap size,
+                        sequence number, entries used, live entries, heap bytes used
+    index    capacity words
+                        slot -> entry number, -1 for empty, -2 for deleted
+    entries  max entries x 6 words
+                        stable hash, key offset, encoded key length (-1 once deleted),
+                        pickled key length, value offset, value length
+    heap     each key encoded then pickled, and each pickled value. Offsets are relative to the
+             start of the heap, and the pickled key follows straight after the encoded one
+
+Keys hash and match the same way as mmaptable: they're encoded by value with hashing.encode_key,
+so equal keys match however they were built, hashed with hashing.stable_hash_bytes, which is the
+same in every process, and matched on the encoded bytes. Only str, bytes, numbers and tuples of
+them can be keys; anything else raises TypeError.
+
+The capacity and heap are fixed when the table is created. Deleting an entry doesn't give
+its space back, and overwriting a value appends the new value to the heap, so size the heap
+for the writes you expect. A full table raises MemoryError.
+
+Writers bump the sequence number to odd, change the entry and index words, and bump it back
+to even (a seqlock). Readers note the sequence number, read, and start again if it was odd or
+has changed since, so they never act on a half-written entry. Values are copied out of the
+heap inside that window and only unpickled once the read is known to be clean. Only one
+process should write at a time; pass the same multiprocessing lock as lock= to each writer
+if more than one needs to.
+'''
+import pickle
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from multiprocessing import resource_tracker, shared_memory
+
+from hashing import encode_key, stable_hash_bytes
+from hashtable import DEFAULT_LOAD_FACTOR
+from mmaptable import PICKLE_PROTOCOL
+
+MAGIC = int.from_bytes(b'HTSHv002', 'little')
+
+_EMPTY = -1
+_DUMMY = -2
+_HEADER_WORDS = 8
+_ENTRY_FIELDS = 6
+_CAPACITY, _MAX_ENTRIES, _HEAP_SIZE, _SEQUENCE, _COUNT, _LEN, _HEAP_USED = range(1, 8)
+
+_created = set() # Blocks this process made, which its resource tracker should go on tracking
+
+class SharedHashTable:
+
+    @classmethod
+    def create(cls, max_capacity, heap_bytes=1 << 20, name=None, max_load_factor=DEFAULT_LOAD_FACTOR, lock=None):
+        if max_capacity <= 1:
+            raise ValueError('Max capacity must be greater than one')
+        if not 0 < max_load_factor < 1:
+            raise ValueError('Max load factor must be between 0 and 1')
+        max_entries = max(1, min(int(max_capacity * max_load_factor), max_capacity - 1))
+        words = _HEADER_WORDS + max_capacity + max_entries * _ENTRY_FIELDS
+        memory = shared_memory.SharedMemory(name=name, create=True, size=words * 8 + heap_bytes)
+        _created.add(memory.name)
+        header = memory.buf[:_HEADER_WORDS * 8].cast('q')
+        header[_CAPACITY] = max_capacity
+        header[_MAX_ENTRIES] = max_entries
+        header[_HEAP_SIZE] = heap_bytes
+        header[_SEQUENCE] = header[_COUNT] = header[_LEN] = header[_HEAP_USED] = 0
+        memory.buf[_HEADER_WORDS * 8:(_HEADER_WORDS + max_capacity) * 8] = b'\xff' * (max_capacity * 8) # Every slot _EMPTY
+        header[0] = MAGIC # Last, so a half-initialised block never looks valid
+        header.release()
+        return cls(memory, lock)
+
+    @classmethod
+    def from_items(cls, iterable, name=None, max_load_factor=DEFAULT_LOAD_FACTOR, heap_bytes=None):
+        # Items are encoded and pickled up front to measure the heap, which by default leaves as much again for overwrites
+        encoded = [(encode_key(key), pickle.dumps(key, PICKLE_PROTOCOL), pickle.dumps(val, PICKLE_PROTOCOL))
+                   for key, val in iterable]
+        if heap_bytes is None:
+            heap_bytes = max(4096, 2 * sum(len(part) for entry in encoded for part in entry))
+        table = cls.create(int(len(encoded) / max_load_factor) + 2, heap_bytes, name, max_load_factor)
+        for key_bytes, pickled_key, val_bytes in encoded:
+            table._store(key_bytes, pickled_key, val_bytes)
+        return table
+
+    @classmethod
+    def attach(cls, name, lock=None):
+        if sys.version_info >= (3, 13):
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        else: # Otherwise this process's resource tracker unlinks the block when it exits
+            memory = shared_memory.SharedMemory(name=name)
+            if memory.name not in _created:
+                resource_tracker.unregister(memory._name, 'shared_memory')
+        return cls(memory, lock)
+
+    def __init__(self, memory, lock=None):
+        self._memory = memory
+        buf = memory.buf
+        header = buf[:_HEADER_WORDS * 8].cast('q')
+        if header[0] != MAGIC:
+            header.release()
+            raise ValueError(f'{memory.name!r} is not a shared hash table')
+        capacity, max_entries = header[_CAPACITY], header[_MAX_ENTRIES]
+        index_end = (_HEADER_WORDS + capacity) * 8
+        entries_end = index_end + max_entries * _ENTRY_FIELDS * 8
+        self._header = header
+        self._indices = buf[_HEADER_WORDS * 8:index_end].cast('q')
+        self._entries = buf[index_end:entries_end].cast('q')
+        self._heap = buf[entries_end:entries_end + header[_HEAP_SIZE]]
+        self._lock = lock or nullcontext()
+
+    def __len__(self):
+        return self._header[_LEN]
+
+    def __getitem__(self, key):
+        val_bytes = self._read(key)
+        if val_bytes is None:
+            raise KeyError(key)
+        return pickle.loads(val_bytes)
+
+    def __contains__(self, key):
+        return self._read(key) is not None
+
+    def __setitem__(self, key, pair):
+        key_bytes = encode_key(key)
+        pickled_key = pickle.dumps(key, PICKLE_PROTOCOL)
+        val_bytes = pickle.dumps(pair, PICKLE_PROTOCOL)
+        with self._lock:
+            self._store(key_bytes, pickled_key, val_bytes)
+
+    def __delitem__(self, key):
+        try:
+            key_bytes = encode_key(key)
+        except TypeError: # Couldn't have been stored
+            raise KeyError(key) from None
+        with self._lock:
+            slot, position = self._find(key_bytes, stable_hash_bytes(key_bytes))
+            if position < 0:
+                raise KeyError(key)
+            with self._writing():
+                self._entries[position * _ENTRY_FIELDS + 2] = -1
+                self._indices[slot] = _DUMMY
+                self._header[_LEN] -= 1
+
+    def __iter__(self):
+        for key_bytes, _ in self._entry_bytes():
+            yield pickle.loads(key_bytes)
+
+    def __str__(self):
+        pairs = [f'{key!r}: {val!r}' for key, val in self.items()]
+        return '{' + ', '.join(pairs) + '}'
+
+    def __repr__(self):
+        cls = self.__class__.__name__
+        return f'{cls}.attach({self.name!r})'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def name(self):
+        return self._memory.name
+
+    @property
+    def capacity(self):
+        return len(self._indices)
+
+    @property
+    def load_factor(self):
+        return len(self) / self.capacity
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [pickle.loads(val_bytes) for _, val_bytes in self._entry_bytes()]
+
+    def items(self):
+        return [(pickle.loads(key_bytes), pickle.loads(val_bytes)) for key_bytes, val_bytes in self._entry_bytes()]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def close(self):
+        for view in (self._header, self._indices, self._entries, self._heap):
+            view.release()
+        self._memory.close()
+
+    def unlink(self):
+        # Frees the block once every process has closed it, call this from the creator
+        self._memory.unlink()
+        _created.discard(self.name)
+
+    @contextmanager
+    def _writing(self):
+        # Seqlock write section: the sequence number is odd for exactly as long as we're inside it
+        header = self._header
+        header[_SEQUENCE] += 1
+        try:
+            yield
+        finally:
+            header[_SEQUENCE] += 1
+
+    def _find(self, key_bytes, hash_value):
+        # (slot, entry number) for key_bytes, or (slot, -1). Compares stored hashes before touching the heap.
+        indices = self._indices
+        entries = self._entries
+        heap = self._heap
+        capacity = len(indices)
+        slot = hash_value % capacity
+        while True:
+            position = indices[slot]
+            if position == _EMPTY:
+                return slot, -1
+            if position >= 0:
+                start = position * _ENTRY_FIELDS
+                if entries[start] == hash_value and entries[start + 2] == len(key_bytes):
+                    key_offset = entries[start + 1]
+                    if heap[key_offset:key_offset + len(key_bytes)] == key_bytes:
+                        return slot, position
+            slot += 1
+            if slot == capacity:
+                slot = 0
+
+    def _read(self, key):
+        # Pickled value for key, or None, retried until no write overlapped it
+        try:
+            key_bytes = encode_key(key)
+        except TypeError: # Couldn't have been stored
+            return None
+        header = self._header
+        hash_value = stable_hash_bytes(key_bytes)
+        while True:
+            sequence = header[_SEQUENCE]
+            if sequence & 1:
+                time.sleep(0)
+                continue
+            try:
+                _, position = self._find(key_bytes, hash_value)
+                if position < 0:
+                    val_bytes = None
+                else:
+                    start = position * _ENTRY_FIELDS
+                    val_offset, val_length = self._entries[start + 4], self._entries[start + 5]
+                    val_bytes = bytes(self._heap[val_offset:val_offset + val_length])
+            except (IndexError, ValueError): # Read a word mid-write, the sequence check below will fail too
+                continue
+            if header[_SEQUENCE] == sequence:
+                return val_bytes
+
+    def _append(self, data):
+        header = self._header
+        offset = header[_HEAP_USED]
+        if offset + len(data) > header[_HEAP_SIZE]:
+            raise MemoryError(f'Shared hash table {self.name!r} is out of heap space')
+        self._heap[offset:offset + len(data)] = data # Past _HEAP_USED, so no reader can see it yet
+        header[_HEAP_USED] = offset + len(data)
+        return offset
+
+    def _store(self, key_bytes, pickled_key, val_bytes):
+        header = self._header
+        hash_value = stable_hash_bytes(key_bytes)
+        slot, position = self._find(key_bytes, hash_value)
+        if position >= 0:
+            val_offset = self._append(val_bytes)
+            with self._writing():
+                start = position * _ENTRY_FIELDS
+                self._entries[start + 4] = val_offset
+                self._entries[start + 5] = len(val_bytes)
+            return
+        position = header[_COUNT]
+        if position == header[_MAX_ENTRIES]:
+            raise MemoryError(f'Shared hash table {self.name!r} is full')
+        key_offset = self._append(key_bytes + pickled_key)
+        val_offset = self._append(val_bytes)
+        start = position * _ENTRY_FIELDS
+        with self._writing():
+            self._entries[start] = hash_value
+            self._entries[start + 1] = key_offset
+            self._entries[start + 2] = len(key_bytes)
+            self._entries[start + 3] = len(pickled_key)
+            self._entries[start + 4] = val_offset
+            self._entries[start + 5] = len(val_bytes)
+            self._indices[slot] = position
+            header[_COUNT] = position + 1
+            header[_LEN] += 1
+
+    def _entry_bytes(self):
+        # (pickled key, pickled value) of every live entry in insertion order, each read under the seqlock
+        header = self._header
+        entries = self._entries
+        heap = self._heap
+        for position in range(header[_COUNT]):
+            start = position * _ENTRY_FIELDS
+            while True:
+                sequence = header[_SEQUENCE]
+                if sequence & 1:
+                    time.sleep(0)
+                    continue
+                _, key_offset, key_length, pickled_length, val_offset, val_length = entries[start:start + _ENTRY_FIELDS].tolist()
+                pair = None if key_length < 0 else (bytes(heap[key_offset + key_length:key_offset + key_length + pickled_length]),
+                                                    bytes(heap[val_offset:val_offset + val_length]))
+                if header[_SEQUENCE] == sequence:
+                    break
+            if pair is not None:
+                yield pair
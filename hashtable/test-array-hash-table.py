@@ -0,0 +1,129 @@
+'''Tests for the NumPy backend (skipped where NumPy isn't installed)'''
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from arraytable import ArrayHashTable
+from hashtable import hashTable
+
+@pytest.fixture
+def array_table():
+    table = hashTable(100, key_dtype='int64', value_dtype='float64')
+    table[1] = 1.5
+    table[-7] = 2.5
+    table[10 ** 12] = 3.5
+    return table
+
+def test_should_create_array_backend_from_hash_table():
+    table = hashTable(max_capacity=100, key_dtype='int64')
+    assert isinstance(table, ArrayHashTable)
+    assert table.capacity == 128
+    assert len(table) == 0
+
+def test_should_not_create_array_backend_with_non_integer_keys():
+    with pytest.raises(TypeError):
+        hashTable(100, key_dtype='float64')
+
+def test_should_find_scalar_values(array_table):
+    assert array_table[1] == 1.5
+    assert array_table[-7] == 2.5
+    assert array_table[10 ** 12] == 3.5
+    assert array_table.get(2) is None
+    assert len(array_table) == 3
+
+def test_should_raise_error_on_missing_key(array_table):
+    with pytest.raises(KeyError) as exception_information:
+        array_table[2]
+    assert exception_information.value.args[0] == 2
+
+def test_should_not_create_array_backend_with_object_values():
+    with pytest.raises(TypeError):
+        hashTable(4, key_dtype='int64', value_dtype=object)
+    with pytest.raises(TypeError):
+        hashTable(4, key_dtype='int64', value_dtype='U10')
+
+def test_should_refuse_values_that_would_be_truncated():
+    table = hashTable(100, key_dtype='int64')
+    with pytest.raises(TypeError):
+        table[1] = 1.9
+    with pytest.raises(OverflowError):
+        hashTable(100, key_dtype='int64', value_dtype='int8').set_many([1, 2], [1, 1000])
+    assert 1 not in table
+    table[1] = True
+    assert table[1] == 1
+    floats = hashTable(100, key_dtype='int64', value_dtype='float64')
+    floats[1] = 2
+    assert floats[1] == 2.0
+
+def test_should_miss_keys_that_cannot_be_stored():
+    table = hashTable(100, key_dtype='uint64')
+    table[1] = 1
+    assert table.get(-1) is None
+    assert table.get('a', 'default') == 'default'
+    with pytest.raises(KeyError):
+        table[2 ** 70]
+    with pytest.raises(KeyError):
+        del table['a']
+
+def test_should_find_key(array_table):
+    assert 1 in array_table
+    assert 2 not in array_table
+    assert 'Missing_Key' not in array_table
+    assert 2 ** 70 not in array_table
+
+def test_should_delete_key(array_table):
+    del array_table[1]
+    assert 1 not in array_table
+    assert len(array_table) == 2
+    with pytest.raises(KeyError):
+        del array_table[1]
+
+def test_should_get_keys_and_values(array_table):
+    assert sorted(array_table.keys().tolist()) == [-7, 1, 10 ** 12]
+    assert sorted(array_table.values().tolist()) == [1.5, 2.5, 3.5]
+    assert sorted(array_table.items()) == [(-7, 2.5), (1, 1.5), (10 ** 12, 3.5)]
+    assert sorted(array_table) == [-7, 1, 10 ** 12]
+
+def test_should_set_and_get_many():
+    table = hashTable(16, key_dtype='int64')
+    keys = np.arange(0, 100000, 7)
+    table.set_many(keys, keys * 2)
+    assert len(table) == len(keys)
+    assert table.load_factor <= 0.7
+    assert (table.get_many(keys) == keys * 2).all()
+    assert table.get_many([1, 2, 3], default=-1).tolist() == [-1, -1, -1]
+    assert table.contains_many([0, 1, 7]).tolist() == [True, False, True]
+
+def test_should_keep_last_value_for_repeated_keys():
+    table = hashTable(16, key_dtype='int64')
+    table.set_many([5, 5, 5], [1, 2, 3])
+    assert table[5] == 3
+    assert len(table) == 1
+
+def test_should_overwrite_existing_keys_in_batch(array_table):
+    array_table.set_many([1, 2], [9.5, 8.5])
+    assert array_table.get_many([1, 2, -7]).tolist() == [9.5, 8.5, 2.5]
+    assert len(array_table) == 4
+
+def test_should_delete_many_and_reuse_slots():
+    table = hashTable(16, key_dtype='int64')
+    table.set_many(np.arange(1000), np.arange(1000))
+    table.delete_many(np.arange(0, 1000, 2))
+    assert len(table) == 500
+    assert table.contains_many(np.arange(4)).tolist() == [False, True, False, True]
+    table.set_many(np.arange(0, 1000, 2), 0)
+    assert len(table) == 1000
+    assert (table.get_many(np.arange(1, 1000, 2)) == np.arange(1, 1000, 2)).all()
+
+def test_should_compare_and_copy(array_table):
+    copy = array_table.copy()
+    assert copy == array_table
+    copy[1] = 0.0
+    assert copy != array_table
+    assert array_table[1] == 1.5
+
+def test_should_use_less_memory_than_boxed_entries():
+    table = hashTable(16, key_dtype='int64')
+    table.set_many(np.arange(100000), np.arange(100000))
+    assert table.nbytes / len(table) < 48 # 17 bytes a slot, at worst just under 0.35 load after doubling
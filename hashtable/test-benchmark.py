@@ -0,0 +1,52 @@
+'''Tests for the benchmark runner'''
+
+import json
+
+import pytest
+
+from benchmark import compare, main, make_accesses, make_keys, run
+
+@pytest.fixture(scope='module')
+def results():
+    return run(sizes=[100], key_kinds=['str'], accesses=['zipf'], operations=200)
+
+def test_should_make_distinct_keys_of_each_kind():
+    for kind in ('int', 'str', 'tuple'):
+        keys = make_keys(kind, 100)
+        assert len(set(keys)) == 100
+    assert isinstance(make_keys('tuple', 1)[0], tuple)
+    with pytest.raises(ValueError):
+        make_keys('float', 1)
+
+def test_should_skew_zipfian_accesses():
+    keys = make_keys('int', 100)
+    accesses = make_accesses(keys, 'zipf', 1000)
+    assert accesses.count(keys[0]) > accesses.count(keys[-1])
+    assert make_accesses(keys, 'uniform', 10) == make_accesses(keys, 'uniform', 10)
+
+def test_should_time_every_operation_against_dict(results):
+    names = {name.split('/')[0] for name in results['results']}
+    assert names == {'memory', 'set', 'len', 'iterate', 'copy', 'eq', 'from_dict', 'get', 'contains', 'mixed'}
+    timings = results['results']['get/str/zipf/100']
+    assert set(timings) == {'hashTable', 'dict', 'vs_dict'}
+    assert timings['hashTable']['p50_ns'] <= timings['hashTable']['p99_ns']
+    assert results['results']['memory/str/100']['hashTable']['bytes_per_entry'] > 0
+
+def test_should_report_regressions(results):
+    slower = json.loads(json.dumps(results))
+    slower['results']['get/str/zipf/100']['hashTable']['ops_per_sec'] /= 2
+    slower['results']['memory/str/100']['hashTable']['bytes_per_entry'] *= 2
+    assert compare(results, results) == []
+    assert [(name, metric) for name, metric, _, _ in compare(results, slower, threshold=0.1)] == [
+        ('memory/str/100', 'bytes_per_entry'), ('get/str/zipf/100', 'ops_per_sec')]
+
+def test_should_exit_with_error_on_regression(tmp_path, capsys):
+    baseline = tmp_path / 'baseline.json'
+    current = tmp_path / 'current.json'
+    assert main(['run', '--sizes', '1e2', '--keys', 'int', '--access', 'uniform', '--operations', '100',
+                 '--output', str(baseline)]) == 0
+    data = json.loads(baseline.read_text())
+    data['results']['mixed/int/uniform/100']['hashTable']['ops_per_sec'] /= 2
+    current.write_text(json.dumps(data))
+    assert main(['compare', str(baseline), str(current)]) == 1
+    assert '1 regressions over 10%' in capsys.readouterr().out
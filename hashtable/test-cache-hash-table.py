@@ -0,0 +1,187 @@
+'''Tests for CacheHashTable'''
+
+import threading
+import time
+
+import pytest
+
+from cachetable import CacheHashTable, LFUPolicy
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def fill(cache, keys):
+    for key in keys:
+        cache[key] = str(key)
+
+def test_should_evict_least_recently_used():
+    cache = CacheHashTable(max_entries=3)
+    fill(cache, 'abc')
+    cache['a']
+    cache['d'] = 'd'
+    assert list(cache) == ['a', 'c', 'd']
+    assert cache.evictions == 1
+
+def test_should_evict_first_inserted():
+    cache = CacheHashTable(max_entries=3, policy='fifo')
+    fill(cache, 'abc')
+    cache['a']
+    cache['a'] = 'A'
+    cache['d'] = 'd'
+    assert 'a' not in cache
+    assert len(cache) == 3
+
+def test_should_evict_least_frequently_used():
+    cache = CacheHashTable(max_entries=3, policy='lfu')
+    fill(cache, 'abc')
+    for _ in range(3):
+        cache['a']
+    cache['b']
+    cache['d'] = 'd'
+    assert 'c' not in cache
+    cache['e'] = 'e'
+    assert 'd' not in cache
+    assert 'a' in cache and 'b' in cache
+
+def test_should_find_least_frequently_used_after_removing_lowest():
+    policy = LFUPolicy()
+    policy.insert('hot')
+    for _ in range(1000):
+        policy.access('hot')
+    policy.insert('warm')
+    policy.access('warm')
+    policy.insert('cold')
+    policy.remove('cold')
+    assert policy._next[0] == 2 # White-box testing: the lowest count is found without counting up to it
+    assert policy.victim() == 'warm'
+    policy.remove('warm')
+    assert policy.victim() == 'hot'
+
+def test_should_evict_by_bytes():
+    cache = CacheHashTable(max_bytes=100, sizeof=lambda key, value: len(value))
+    cache['a'] = 'x' * 60
+    cache['b'] = 'x' * 30
+    cache['c'] = 'x' * 30
+    assert 'a' not in cache
+    assert cache.nbytes == 60
+
+def test_should_not_create_cache_with_invalid_limits():
+    with pytest.raises(ValueError):
+        CacheHashTable(max_entries=0)
+    with pytest.raises(ValueError):
+        CacheHashTable(max_bytes=-1)
+
+def test_should_expire_entries_lazily():
+    clock = FakeClock()
+    cache = CacheHashTable(max_entries=10, ttl=5, clock=clock)
+    cache['a'] = 1
+    cache.set('b', 2, ttl=None)
+    clock.now = 4
+    assert cache['a'] == 1
+    clock.now = 5
+    assert 'a' not in cache
+    with pytest.raises(KeyError):
+        cache['a']
+    assert cache.get('b') == 2
+    assert cache.expirations == 1
+    assert len(cache) == 1
+
+def test_should_expire_and_use_entries_read_in_batch():
+    clock = FakeClock()
+    cache = CacheHashTable(max_entries=3, ttl=5, clock=clock)
+    fill(cache, 'abc')
+    clock.now = 5
+    cache.set('b', 'B', ttl=None)
+    cache.set('c', 'C', ttl=None)
+    assert cache.get_many(['a', 'b', 'c'], default='missing') == ['missing', 'B', 'C']
+    assert cache.expirations == 1
+    cache.get_many(['b'])
+    cache['d'] = 'd'
+    cache['e'] = 'e'
+    assert list(cache) == ['b', 'd', 'e']
+
+def test_should_reload_expired_key_many_times():
+    clock = FakeClock()
+    cache = CacheHashTable(max_entries=10, ttl=1, clock=clock)
+    for number in range(1000):
+        clock.now = number
+        assert cache.get_or_load('key', lambda key: number) == number
+    assert len(cache) == 1
+    assert cache.expirations == 999
+
+def test_should_count_hits_and_misses():
+    cache = CacheHashTable(max_entries=10)
+    cache['a'] = 1
+    cache.get('a')
+    cache.get('b')
+    'a' in cache
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_should_load_missing_key_once():
+    cache = CacheHashTable(max_entries=10)
+    calls = []
+    started = threading.Event()
+
+    def loader(key):
+        calls.append(key)
+        started.set()
+        time.sleep(0.05)
+        return key.upper()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('a', loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == ['a']
+    assert results == ['A'] * 8
+    assert cache.get_or_load('a', loader) == 'A'
+    assert calls == ['a']
+
+def test_should_not_load_again_when_another_load_finished_after_miss():
+    calls = []
+
+    def loader(key):
+        calls.append(key)
+        return key.upper()
+
+    class RacingCache(CacheHashTable):
+        racing = True
+
+        def __getitem__(self, key):
+            try:
+                return super().__getitem__(key)
+            except KeyError:
+                if self.racing: # Another caller's whole load runs between our miss and taking the lock
+                    self.racing = False
+                    self.get_or_load(key, loader)
+                raise
+
+    cache = RacingCache(max_entries=10)
+    assert cache.get_or_load('a', loader) == 'A'
+    assert calls == ['a']
+
+def test_should_share_loader_error():
+    cache = CacheHashTable(max_entries=10)
+
+    def loader(key):
+        raise LookupError(key)
+
+    with pytest.raises(LookupError):
+        cache.get_or_load('a', loader)
+    assert 'a' not in cache
+    assert cache.get_or_load('a', str.upper) == 'A'
+
+def test_should_update_and_delete_many():
+    cache = CacheHashTable(max_entries=3)
+    cache.update({'a': 1, 'b': 2}, c=3, d=4)
+    assert list(cache) == ['b', 'c', 'd']
+    cache.delete_many(['b', 'c'])
+    assert list(cache) == ['d']
+    cache.set_many([('e', 5), ('f', 6), ('g', 7)])
+    assert list(cache) == ['e', 'f', 'g']
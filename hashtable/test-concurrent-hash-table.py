@@ -0,0 +1,162 @@
+'''Tests for ConcurrentHashTable, including a multi-threaded stress test'''
+
+import random
+import sys
+import threading
+
+import pytest
+
+from concurrenttable import ConcurrentHashTable
+
+@pytest.fixture
+def hash_table():
+    sample_data = ConcurrentHashTable(max_capacity=100)
+    sample_data['Hola'] = 'Hello'
+    sample_data[98.6] = 37
+    sample_data[False] = True
+    return sample_data
+
+@pytest.fixture
+def fast_switching():
+    # Hand the GIL over far more often than usual, so threads interleave inside table methods
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+def run_threads(target, count):
+    threads = [threading.Thread(target=target, args=(number,)) for number in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_should_behave_like_hash_table(hash_table):
+    assert hash_table['Hola'] == 'Hello'
+    assert 98.6 in hash_table
+    assert hash_table.get('Missing_Key') is None
+    del hash_table['Hola']
+    assert list(hash_table) == [98.6, False]
+    with pytest.raises(KeyError):
+        hash_table['Hola']
+
+def test_should_setdefault(hash_table):
+    assert hash_table.setdefault('Hola', 'Bonjour') == 'Hello'
+    assert hash_table.setdefault('new', 'key') == 'key'
+    assert hash_table['new'] == 'key'
+
+def test_should_pop(hash_table):
+    assert hash_table.pop('Hola') == 'Hello'
+    assert 'Hola' not in hash_table
+    assert hash_table.pop('Hola', 'default') == 'default'
+    with pytest.raises(KeyError):
+        hash_table.pop('Hola')
+
+def test_should_compute_if_absent(hash_table):
+    assert hash_table.compute_if_absent('Hola', lambda key: 'Bonjour') == 'Hello'
+    assert hash_table.compute_if_absent('new', str.upper) == 'NEW'
+    assert hash_table['new'] == 'NEW'
+
+def test_should_compare_and_set(hash_table):
+    assert not hash_table.compare_and_set('Hola', 'Bonjour', 'Hi')
+    assert hash_table.compare_and_set('Hola', 'Hello', 'Hi')
+    assert hash_table['Hola'] == 'Hi'
+    assert not hash_table.compare_and_set('Missing_Key', None, 'value')
+
+def test_should_copy_as_concurrent_table(hash_table):
+    copy = hash_table.copy()
+    assert isinstance(copy, ConcurrentHashTable)
+    assert copy.snapshot() == hash_table.snapshot()
+
+def test_should_copy_without_invalidating_readers(hash_table):
+    version = hash_table._version # White-box testing
+    hash_table.copy()
+    hash_table.snapshot()
+    assert hash_table._version == version
+
+def test_should_count_with_compare_and_set_from_many_threads(fast_switching):
+    hash_table = ConcurrentHashTable(max_capacity=10)
+    hash_table['counter'] = 0
+
+    def increment(_):
+        for _ in range(500):
+            while True:
+                current = hash_table['counter']
+                if hash_table.compare_and_set('counter', current, current + 1):
+                    break
+
+    run_threads(increment, 8)
+    assert hash_table['counter'] == 4000
+
+def test_should_compute_each_key_once(fast_switching):
+    hash_table = ConcurrentHashTable(max_capacity=10)
+    calls = []
+
+    def load(key):
+        calls.append(key)
+        return key * 2
+
+    def worker(_):
+        for key in range(200):
+            assert hash_table.compute_if_absent(key, load) == key * 2
+
+    run_threads(worker, 8)
+    assert sorted(calls) == list(range(200))
+
+def test_should_let_functions_write_to_table_during_batch_writes(fast_switching):
+    hash_table = ConcurrentHashTable(max_capacity=10)
+
+    def load(key):
+        hash_table[('loaded', key)] = key
+        return key
+
+    def worker(number):
+        for key in range(200):
+            if number % 2:
+                hash_table.set_many([(('batch', number, key), key)])
+            else:
+                assert hash_table.compute_if_absent(key, load) == key
+
+    run_threads(worker, 4)
+    assert all(hash_table[('loaded', key)] == key for key in range(200))
+
+def test_should_share_function_error(hash_table):
+    def load(key):
+        raise LookupError(key)
+
+    with pytest.raises(LookupError):
+        hash_table.compute_if_absent('new', load)
+    assert 'new' not in hash_table
+    assert hash_table.compute_if_absent('new', str.upper) == 'NEW'
+
+def test_should_stress_reads_during_writes_and_resizes(fast_switching):
+    hash_table = ConcurrentHashTable(max_capacity=10)
+    errors = []
+
+    def writer(number):
+        rnd = random.Random(number)
+        for _ in range(3000):
+            key = rnd.randrange(2000)
+            if rnd.random() < 0.7:
+                hash_table[key] = -key
+            else:
+                hash_table.pop(key, None)
+
+    def reader(number):
+        rnd = random.Random(number)
+        for _ in range(6000):
+            key = rnd.randrange(2000)
+            value = hash_table.get(key)
+            if value is not None and value != -key: # A torn read would show another key's value
+                errors.append((key, value))
+
+    threads = [threading.Thread(target=writer, args=(number,)) for number in range(4)]
+    threads += [threading.Thread(target=reader, args=(number,)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    snapshot = hash_table.snapshot()
+    assert len(hash_table) == len(snapshot)
+    assert all(hash_table[key] == -key for key in snapshot)
@@ -7,7 +7,8 @@
 
 import pytest
 from pytest_unordered import unordered
-from hashtable import hashTable
+from hashing import splitmix64, stable_hash
+from hashtable import BATCH_CHUNK, FLOOD_PROBE_LIMIT, Change, hashTable
 
 def test_should_pass():
     assert hashTable(max_capacity=100) is not None
@@ -16,7 +17,7 @@ def test_max_capacity_report():
     assert len(hashTable(max_capacity=100)) == 0
 
 def test_create_empty_value_slots():
-    assert hashTable(max_capacity=3)._pair == [None, None, None] # White-box testing
+    assert hashTable(max_capacity=3)._indices.tolist() == [-1, -1, -1] # White-box testing
 
 # Key: Value Insertion
 def test_insert_keys_and_value_pairs():
@@ -29,15 +30,16 @@ def test_insert_keys_and_value_pairs():
     hash_table[False] = True
 
     # Then
-    assert ('Hola', 'Hello') in hash_table._pair
-    assert (98.6, 37) in hash_table._pair
-    assert (False, True) in hash_table._pair
+    entries = list(zip(hash_table._keys, hash_table._values)) # White-box testing
+    assert ('Hola', 'Hello') in entries
+    assert (98.6, 37) in entries
+    assert (False, True) in entries
 
     # Additional insertion for additional test
     assert len(hash_table) == 3
 
 def test_table_should_not_contain_none_value_when_created():
-    assert None not in hashTable(max_capacity=100).values
+    assert None not in hashTable(max_capacity=100).values()
 
 def test_insert_none_value():
     hash_table = hashTable(max_capacity=100)
@@ -108,27 +110,32 @@ def test_should_return_duplicate_values():
     hash_table['Alice'] = 24
     hash_table['Bob'] = 42
     hash_table['Joe'] = 42
-    assert [24, 42, 42] == sorted(hash_table.values)
+    assert [24, 42, 42] == sorted(hash_table.values())
 
 # Won't take order into account when comparing 2 (or more) lists
 def test_should_get_unordered_values(hash_table):
-    assert unordered(hash_table.values) == ['Hello', 37, True]
+    assert unordered(list(hash_table.values())) == ['Hello', 37, True]
 
 def test_should_get_values_of_empty_hash_table():
-    assert hashTable(max_capacity=100).values == []
+    assert list(hashTable(max_capacity=100).values()) == []
 
 def test_should_return_copy_of_values(hash_table):
-    assert hash_table.values is not hash_table.values
+    snapshot = hash_table.snapshot()
+    assert snapshot is not hash_table.snapshot()
+    snapshot['Hola'] = 'Bonjour'
+    assert hash_table['Hola'] == 'Hello'
 
 # Tests to ensure hash table keys are unique
 def test_should_get_keys(hash_table):
-    assert hash_table.keys == {'Hola', 98.6, False}
+    assert hash_table.keys() == {'Hola', 98.6, False}
 
 def test_should_get_keys_of_empty_hash_table():
-    assert hashTable(max_capacity=100).keys == set() # No empty set literal in Python
+    assert hashTable(max_capacity=100).keys() == set() # No empty set literal in Python
 
 def test_should_return_copy_of_keys(hash_table):
-    assert hash_table.keys is not hash_table.keys
+    snapshot = hash_table.snapshot()
+    del snapshot['Hola']
+    assert 'Hola' in hash_table.keys()
 
 def test_should_return_kv_pairs(hash_table):
     assert hash_table.pair == {
@@ -142,9 +149,9 @@ def test_should_get_pairs_from_empty_hash_table():
 
 def test_should_convert_to_dict(hash_table):
     dictionary = dict(hash_table.pair)
-    assert set(dictionary.keys()) == hash_table.keys
+    assert set(dictionary.keys()) == hash_table.keys()
     assert set(dictionary.items()) == hash_table.pair
-    assert list(dictionary.values()) == unordered(hash_table.values)
+    assert list(dictionary.values()) == unordered(list(hash_table.values()))
 
 # Hash table length
 def test_should_report_length_of_empty_hash_table():
@@ -169,17 +176,17 @@ def test_should_report_capcity(hash_table):
 
 # Making Hash Table Iterable
 def test_should_iterate_over_keys(hash_table):
-    for key in hash_table.keys:
+    for key in hash_table.keys():
         assert key in ('Hola', 98.6, False)
 
 def test_should_iterate_over_values(hash_table):
-    for value in hash_table.values:
+    for value in hash_table.values():
         assert value in ('Hello', 37, True)
 
 def test_should_iterate_over_pairs(hash_table):
     for key, val in hash_table.pair:
-        assert key in hash_table.keys
-        assert val in hash_table.values
+        assert key in hash_table.keys()
+        assert val in hash_table.values()
 
 def test_should_iterate_over_hashTable_instance(hash_table):
     for key in hash_table:
@@ -201,10 +208,10 @@ def test_should_create_hash_table_from_dict():
 
     hash_table = hashTable.from_dict(dictionary)
 
-    assert hash_table.capacity == len(dictionary) * 10
-    assert hash_table.keys == set(dictionary.keys())
+    assert hash_table.capacity == int(len(dictionary) / 0.7) + 1
+    assert hash_table.keys() == set(dictionary.keys())
     assert hash_table.pair == set(dictionary.items())
-    assert unordered(hash_table.values) == list(dictionary.values())
+    assert unordered(list(hash_table.values())) == list(dictionary.values())
 
 def test_should_have_canonical_string_representation(hash_table):
     assert repr(hash_table) in {
@@ -239,8 +246,8 @@ def test_should_compare_unequal_with_another_data_type(hash_table):
 def test_should_copy_key_val_pairs_and_capacity(hash_table):
     copy = hash_table.copy()
     assert copy is not hash_table
-    assert set(hash_table.keys) == set(copy.keys)
-    assert unordered(hash_table.values) == copy.values
+    assert set(hash_table.keys()) == set(copy.keys())
+    assert unordered(list(hash_table.values())) == list(copy.values())
     assert set(hash_table.pair) == set(copy.pair)
     assert hash_table.capacity == copy.capacity
 
@@ -248,4 +255,442 @@ def test_should_compare_equality_of_tables_with_different_capacity():
     data = {'a': 1, 'b': 2, 'c': 3}
     hash_table_1 = hashTable.from_dict(data, capacity=42)
     hash_table_2 = hashTable.from_dict(data, capacity=100)
-    assert hash_table_1 == hash_table_2
\ No newline at end of file
+    assert hash_table_1 == hash_table_2
+
+# Views and Snapshots
+def test_should_view_live_keys(hash_table):
+    keys = hash_table.keys()
+    hash_table['new'] = 'key'
+    assert 'new' in keys
+    assert len(keys) == 4
+
+def test_should_get_items(hash_table):
+    assert hash_table.items() == {('Hola', 'Hello'), (98.6, 37), (False, True)}
+    assert ('Hola', 'Hello') in hash_table.items()
+    assert ('Hola', 'Bonjour') not in hash_table.items()
+
+def test_should_snapshot_as_dict(hash_table):
+    assert hash_table.snapshot() == {'Hola': 'Hello', 98.6: 37, False: True}
+
+def test_should_track_length_through_updates_and_deletes(hash_table):
+    hash_table['Hola'] = 'Bonjour'
+    assert len(hash_table) == 3
+    del hash_table[98.6]
+    assert len(hash_table) == 2
+
+# Collision Resolution
+def test_should_keep_colliding_keys():
+    hash_table = hashTable(max_capacity=10)
+    hash_table[1] = 'one'
+    hash_table[11] = 'eleven'
+    hash_table[21] = 'twenty-one'
+    assert hash_table[1] == 'one'
+    assert hash_table[11] == 'eleven'
+    assert hash_table[21] == 'twenty-one'
+    assert len(hash_table) == 3
+
+def test_should_find_key_probed_past_deleted_slot():
+    hash_table = hashTable(max_capacity=10)
+    hash_table[1] = 'one'
+    hash_table[11] = 'eleven'
+    del hash_table[1]
+    assert 1 not in hash_table
+    assert hash_table[11] == 'eleven'
+
+def test_should_reuse_deleted_slot():
+    hash_table = hashTable(max_capacity=10)
+    hash_table[1] = 'one'
+    del hash_table[1]
+    hash_table[11] = 'eleven'
+    assert hash_table._indices[1] == 1 # White-box testing
+    assert len(hash_table) == 1
+
+def test_should_raise_error_on_deleting_missing_key(hash_table):
+    with pytest.raises(KeyError):
+        del hash_table['Missing_Key']
+
+# Load Factor and Resizing
+def test_should_report_load_factor(hash_table):
+    assert hash_table.load_factor == 0.03
+
+def test_should_report_load_factor_of_empty_hash_table():
+    assert hashTable(max_capacity=100).load_factor == 0
+
+def test_should_not_create_hash_table_with_invalid_load_factor():
+    with pytest.raises(ValueError):
+        hashTable(max_capacity=100, max_load_factor=1)
+
+def test_should_grow_past_load_factor():
+    hash_table = hashTable(max_capacity=10)
+    for key in range(100):
+        hash_table[key] = str(key)
+    assert hash_table.capacity > 100
+    assert hash_table.load_factor <= 0.7
+    assert all(hash_table[key] == str(key) for key in range(100))
+
+def test_should_resize_incrementally():
+    hash_table = hashTable(max_capacity=100)
+    for key in range(71):
+        hash_table[key] = key
+    assert hash_table._migrating # White-box testing
+    assert all(hash_table[key] == key for key in range(71))
+    for key in range(71, 100):
+        hash_table[key] = key
+    assert not hash_table._migrating
+    assert len(hash_table) == 100
+    assert all(hash_table[key] == key for key in range(100))
+
+def test_should_update_and_delete_during_resize():
+    hash_table = hashTable(max_capacity=100)
+    for key in range(71):
+        hash_table[key] = key
+    hash_table[70] = 'updated'
+    del hash_table[0]
+    assert hash_table[70] == 'updated'
+    assert 0 not in hash_table
+    assert len(hash_table) == 70
+
+def test_should_compact_deleted_entries_on_resize():
+    hash_table = hashTable(max_capacity=10)
+    for key in range(1000):
+        hash_table[key] = key
+        del hash_table[key]
+    hash_table['last'] = 'entry'
+    assert hash_table.capacity == 10
+    assert len(hash_table._keys) < 10 # White-box testing
+
+def test_should_compact_when_reinserting_into_deleted_slots():
+    hash_table = hashTable(max_capacity=10)
+    for number in range(1000):
+        hash_table['a'] = number
+        del hash_table['a']
+    assert len(hash_table._keys) < 10 # White-box testing
+    snapshot = {}
+    for number in range(20000):
+        key = number * 7919 % 3000
+        if number % 3:
+            hash_table[key] = snapshot[key] = number
+        elif key in snapshot:
+            del hash_table[key], snapshot[key]
+    assert hash_table.snapshot() == snapshot
+
+# Cached Hashes
+def test_should_hash_each_key_once_per_operation():
+    hash_table = hashTable.from_dict({'a': 1, 'b': 2, 'c': 3})
+    assert hash_table.hash_calls == 3
+    hash_table['a']
+    assert hash_table.hash_calls == 4
+
+def test_should_not_rehash_on_resize():
+    hash_table = hashTable(max_capacity=10)
+    for key in range(1000):
+        hash_table[key] = key
+    assert hash_table.hash_calls == 1000
+
+def test_should_not_rehash_on_copy_or_equality(hash_table):
+    hash_calls = hash_table.hash_calls
+    copy = hash_table.copy()
+    assert copy == hash_table
+    assert hash_table == copy
+    assert hash_table.hash_calls == hash_calls
+    assert copy.hash_calls == 0
+
+def test_should_copy_independently(hash_table):
+    copy = hash_table.copy()
+    copy['Hola'] = 'Bonjour'
+    del copy[98.6]
+    assert hash_table['Hola'] == 'Hello'
+    assert 98.6 in hash_table
+
+def test_should_copy_during_resize():
+    hash_table = hashTable(max_capacity=100)
+    for key in range(71):
+        hash_table[key] = key
+    copy = hash_table.copy()
+    for key in range(71, 200):
+        copy[key] = key
+    assert list(copy) == list(range(200))
+    assert list(hash_table) == list(range(71))
+
+def test_should_compare_unequal_values():
+    hash_table_1 = hashTable.from_dict({'a': 1, 'b': 2})
+    hash_table_2 = hashTable.from_dict({'a': 1, 'b': 3})
+    assert hash_table_1 != hash_table_2
+
+def test_should_compare_tables_with_unhashable_values():
+    assert hashTable.from_dict({'a': [1]}) == hashTable.from_dict({'a': [1]})
+
+# Bulk Construction and Batch Operations
+def test_should_create_hash_table_from_items():
+    hash_table = hashTable.from_items([('Hola', 'Hello'), (98.6, 37), (False, True)])
+    assert list(hash_table.items()) == [('Hola', 'Hello'), (98.6, 37), (False, True)]
+    assert hash_table.hash_calls == 3
+
+def test_should_create_hash_table_from_generator():
+    hash_table = hashTable.from_items((number, number * 2) for number in range(1000))
+    assert len(hash_table) == 1000
+    assert hash_table[999] == 1998
+    assert hash_table.load_factor <= 0.7
+
+def test_should_size_hash_table_from_length_hint():
+    hash_table = hashTable.from_items(iter([(number, number) for number in range(50000)]))
+    assert hash_table.capacity == int(50000 / 0.7) + 1
+    assert hash_table.stats().resizes == 0
+
+def test_should_stream_items_in_chunks():
+    hash_table = hashTable(max_capacity=8)
+    lengths_seen = []
+
+    def pairs():
+        for number in range(3 * BATCH_CHUNK):
+            lengths_seen.append(len(hash_table))
+            yield number, number
+
+    hash_table.set_many(pairs())
+    assert len(hash_table) == 3 * BATCH_CHUNK
+    assert lengths_seen[-1] == 2 * BATCH_CHUNK # Earlier chunks were in before the last one was read
+    assert hash_table.stats().resizes < 10
+
+def test_should_create_hash_table_from_items_with_capacity():
+    hash_table = hashTable.from_items([('a', 1)], capacity=100)
+    assert hash_table.capacity == 100
+
+def test_should_set_many(hash_table):
+    hash_table.set_many([('Hola', 'Bonjour'), ('new', 'key'), ('new', 'value')])
+    assert list(hash_table.items()) == [('Hola', 'Bonjour'), (98.6, 37), (False, True), ('new', 'value')]
+    assert len(hash_table) == 4
+
+def test_should_set_many_during_resize():
+    hash_table = hashTable(max_capacity=100)
+    for key in range(71):
+        hash_table[key] = key
+    hash_table.set_many((key, key) for key in range(50, 500))
+    assert list(hash_table) == list(range(500))
+
+def test_should_get_many(hash_table):
+    assert hash_table.get_many(['Hola', 'Missing_Key', False]) == ['Hello', None, True]
+    assert hash_table.get_many(['Missing_Key'], default=0) == [0]
+
+def test_should_delete_many(hash_table):
+    hash_table.delete_many(['Hola', False])
+    assert list(hash_table) == [98.6]
+    assert len(hash_table) == 1
+
+def test_should_raise_error_on_deleting_many_with_missing_key(hash_table):
+    with pytest.raises(KeyError):
+        hash_table.delete_many(['Hola', 'Missing_Key'])
+    assert hash_table['Hola'] == 'Hello' # Nothing is deleted unless every key is there
+    assert len(hash_table) == 3
+    assert hash_table.stats().deletes == 0
+
+def test_should_delete_repeated_key_once(hash_table):
+    hash_table.delete_many(['Hola', 'Hola', False])
+    assert list(hash_table) == [98.6]
+    assert hash_table.stats().deletes == 2
+
+def test_should_update_from_dict_and_keywords(hash_table):
+    hash_table.update({'Hola': 'Bonjour'}, extra='value')
+    assert hash_table['Hola'] == 'Bonjour'
+    assert hash_table['extra'] == 'value'
+    assert len(hash_table) == 4
+
+def test_should_update_from_pairs(hash_table):
+    hash_table.update([('a', 1), ('b', 2)])
+    assert hash_table.get_many(['a', 'b']) == [1, 2]
+
+def test_should_update_from_hash_table_without_rehashing(hash_table):
+    other_table = hashTable.from_dict({'a': 1, 'Hola': 'Bonjour'})
+    hash_calls = hash_table.hash_calls
+    hash_table.update(other_table)
+    assert hash_table.hash_calls == hash_calls
+    assert hash_table.snapshot() == {'Hola': 'Bonjour', 98.6: 37, False: True, 'a': 1}
+
+# Statistics and Profiling
+def test_should_report_stats(hash_table):
+    stats = hash_table.stats()
+    assert stats.length == 3
+    assert stats.capacity == 100
+    assert stats.load_factor == 0.03
+    assert sum(stats.probe_lengths.values()) == 3
+    assert stats.max_probe >= 1
+    assert stats.mean_probe >= 1
+    assert stats.sets == 3
+    assert stats.hash_calls == 3
+
+def test_should_report_probe_lengths_and_clusters_of_colliding_keys():
+    hash_table = hashTable(max_capacity=10)
+    for key in (1, 11, 21, 5):
+        hash_table[key] = key
+    stats = hash_table.stats()
+    assert stats.probe_lengths == {1: 2, 2: 1, 3: 1}
+    assert stats.max_probe == 3
+    assert stats.mean_probe == 7 / 4
+    assert stats.clusters == {3: 1, 1: 1}
+
+def test_should_report_tombstones_and_operations(hash_table):
+    del hash_table['Hola']
+    hash_table.get(98.6)
+    hash_table.get_many([False, 'Missing_Key'])
+    stats = hash_table.stats()
+    assert stats.tombstone_ratio == 1 / 3
+    assert (stats.gets, stats.sets, stats.deletes) == (3, 3, 1)
+
+def test_should_count_resizes():
+    hash_table = hashTable(max_capacity=10)
+    for key in range(100):
+        hash_table[key] = key
+    stats = hash_table.stats()
+    assert stats.resizes > 0
+    assert sum(stats.probe_lengths.values()) == 100
+
+def test_should_report_stats_during_resize():
+    hash_table = hashTable(max_capacity=100)
+    for key in range(71):
+        hash_table[key] = key
+    assert hash_table._migrating # White-box testing
+    assert sum(hash_table.stats().probe_lengths.values()) == 71
+
+def test_should_sample_lookups_when_profiling(hash_table):
+    hash_table.profile(sample_every=2)
+    for _ in range(4):
+        hash_table['Hola']
+    assert len(hash_table.slow_lookups) == 2
+    assert hash_table.slow_lookups[0].key == 'Hola'
+    assert hash_table.slow_lookups[0].probes >= 1
+    hash_table.stop_profiling()
+    hash_table['Hola']
+    assert len(hash_table.slow_lookups) == 2
+
+def test_should_report_probes_past_deleted_slots():
+    hash_table = hashTable(max_capacity=10)
+    for key in (1, 11, 21):
+        hash_table[key] = key
+    del hash_table[11]
+    hash_table.profile(sample_every=1)
+    hash_table.get(31)
+    hash_table.get(21)
+    assert [lookup.probes for lookup in hash_table.slow_lookups] == [4, 3] # 31 goes past the DUMMY to the EMPTY slot 4
+
+def test_should_only_report_lookups_over_threshold(hash_table):
+    slow = []
+    hash_table.profile(hook=slow.append, threshold=60, sample_every=1)
+    hash_table['Hola']
+    with pytest.raises(KeyError):
+        hash_table['Missing_Key']
+    assert slow == []
+
+# Hash Functions
+COLLIDING_INTS = [1 + number * (2 ** 61 - 1) for number in range(2000)] # hash() of every one is 1
+
+def test_should_use_hash_function():
+    hash_table = hashTable.from_dict({'Hola': 'Hello', 98.6: 37, False: True}, hash_function=stable_hash)
+    assert hash_table.hash_function is stable_hash
+    assert hash_table['Hola'] == 'Hello'
+    assert hash_table[0] is True
+    assert hash_table._hashes[0] == stable_hash('Hola') # White-box testing
+
+def test_should_switch_to_random_hash_when_flooded():
+    hash_table = hashTable(max_capacity=8)
+    for number, key in enumerate(COLLIDING_INTS):
+        hash_table[key] = number
+    assert hash_table.hash_function.__name__ == 'random_hash'
+    assert hash_table.stats().max_probe < FLOOD_PROBE_LIMIT
+    assert list(hash_table.values()) == list(range(2000))
+    assert all(hash_table[key] == number for number, key in enumerate(COLLIDING_INTS))
+
+def test_should_switch_to_random_hash_when_flooded_in_bulk():
+    hash_table = hashTable.from_items((key, number) for number, key in enumerate(COLLIDING_INTS))
+    assert hash_table.hash_function.__name__ == 'random_hash'
+    assert len(hash_table) == 2000
+    assert hash_table.get_many(COLLIDING_INTS[-2:]) == [1998, 1999]
+
+def test_should_not_switch_hash_without_max_probe():
+    hash_table = hashTable(max_capacity=8, max_probe=None)
+    for key in COLLIDING_INTS[:600]:
+        hash_table[key] = key
+    assert hash_table.hash_function is hash
+
+def test_should_compare_and_update_across_hash_functions(hash_table):
+    other_table = hashTable.from_dict(hash_table.snapshot(), hash_function=splitmix64)
+    assert hash_table == other_table
+    other_table['Hola'] = 'Bonjour'
+    assert hash_table != other_table
+    hash_table.update(other_table)
+    assert hash_table['Hola'] == 'Bonjour'
+    assert hash_table.copy().hash_function is hash
+    assert other_table.copy().hash_function is splitmix64
+
+# Merging and Reconciling Tables
+def test_should_merge_tables(hash_table):
+    other_table = hashTable.from_dict({'Hola': 'Bonjour', 'a': 1})
+    merged = hash_table | other_table
+    assert list(merged.items()) == [('Hola', 'Bonjour'), (98.6, 37), (False, True), ('a', 1)]
+    assert hash_table['Hola'] == 'Hello'
+    assert list(({'b': 2} | hash_table).keys()) == ['b', 'Hola', 98.6, False]
+    with pytest.raises(TypeError):
+        hash_table | [('a', 1)]
+
+def test_should_merge_in_place(hash_table):
+    original = hash_table
+    hash_table |= {'Hola': 'Bonjour'}
+    hash_table |= [('a', 1)]
+    assert hash_table is original
+    assert hash_table.snapshot() == {'Hola': 'Bonjour', 98.6: 37, False: True, 'a': 1}
+
+def test_should_intersect_and_subtract_keys(hash_table):
+    other_table = hashTable.from_dict({False: 'other', 'Hola': 'other', 'a': 1})
+    hash_calls = hash_table.hash_calls + other_table.hash_calls
+    assert (hash_table & other_table).snapshot() == {'Hola': 'Hello', False: True}
+    assert (hash_table - other_table).snapshot() == {98.6: 37}
+    assert hash_table.hash_calls + other_table.hash_calls == hash_calls
+    assert list((hash_table & {98.6, 'Hola'}).keys()) == ['Hola', 98.6]
+    assert (hash_table - {'Hola': None}).snapshot() == {98.6: 37, False: True}
+
+def test_should_diff_tables(hash_table):
+    other_table = hashTable.from_dict({'Hola': 'Bonjour', False: True, 'a': [1]}, hash_function=splitmix64)
+    assert list(hash_table.diff(other_table)) == [
+        Change('changed', 'Hola', 'Hello', 'Bonjour'),
+        Change('removed', 98.6, 37, None),
+        Change('added', 'a', None, [1]),
+    ]
+    assert list(hash_table.diff(hash_table.snapshot())) == []
+    assert list(hashTable(max_capacity=1).diff({'a': 1})) == [Change('added', 'a', None, 1)]
+
+# Insertion Order
+def test_should_iterate_in_insertion_order():
+    hash_table = hashTable(max_capacity=100)
+    for key in ['c', 'a', 'b', 98.6, False]:
+        hash_table[key] = str(key)
+    assert list(hash_table) == ['c', 'a', 'b', 98.6, False]
+    assert list(hash_table.values()) == ['c', 'a', 'b', '98.6', 'False']
+
+def test_should_use_insertion_order_for_str(hash_table):
+    assert str(hash_table) == "{'Hola': 'Hello', 98.6: 37, False: True}"
+
+def test_should_keep_position_of_updated_key(hash_table):
+    hash_table['Hola'] = 'Bonjour'
+    assert list(hash_table.items()) == [('Hola', 'Bonjour'), (98.6, 37), (False, True)]
+
+def test_should_move_reinserted_key_to_the_end(hash_table):
+    del hash_table['Hola']
+    hash_table['Hola'] = 'Hello'
+    assert list(hash_table) == [98.6, False, 'Hola']
+
+def test_should_keep_insertion_order_through_resize():
+    hash_table = hashTable(max_capacity=10)
+    keys = [f'key{number}' for number in range(500)]
+    for key in keys:
+        hash_table[key] = key
+        if hash_table._migrating: # White-box testing
+            assert list(hash_table) == keys[:len(hash_table)]
+    for key in keys[::3]:
+        del hash_table[key]
+    assert list(hash_table) == [key for index, key in enumerate(keys) if index % 3]
+
+def test_should_copy_in_insertion_order(hash_table):
+    assert list(hash_table.copy()) == ['Hola', 98.6, False]
+
+def test_should_size_index_by_capacity():
+    assert hashTable(max_capacity=100)._indices.itemsize == 1 # White-box testing
+    assert hashTable(max_capacity=1000)._indices.itemsize == 2
+    assert hashTable(max_capacity=100000)._indices.itemsize == 4
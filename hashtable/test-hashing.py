@@ -0,0 +1,55 @@
+'''Tests for the hash functions'''
+
+import subprocess
+import sys
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from hashing import fibonacci_hash, keyed_hash, random_hash, splitmix64, stable_hash
+from hashtable import hashTable
+from plotting import compare
+
+HASH_FUNCTIONS = [splitmix64, fibonacci_hash, stable_hash, keyed_hash(b'secret'), random_hash()]
+
+@pytest.mark.parametrize('hash_function', HASH_FUNCTIONS)
+def test_should_agree_with_equality(hash_function):
+    assert hash_function(1) == hash_function(1.0) == hash_function(True)
+    assert hash_function((1, 'a')) == hash_function((1.0, 'a'))
+
+@pytest.mark.parametrize('hash_function', HASH_FUNCTIONS)
+def test_should_agree_with_equality_across_number_types(hash_function):
+    assert hash_function(1) == hash_function(1 + 0j) == hash_function(Decimal(1)) == hash_function(Fraction(2, 2))
+    assert hash_function(0.5) == hash_function(Decimal('0.5')) == hash_function(Fraction(1, 2))
+    assert hash_function(float('inf')) == hash_function(Decimal('Infinity'))
+
+def test_should_find_equal_keys_of_other_number_types():
+    hash_table = hashTable.from_dict({1: 'a', 0.25: 'b', (2, 'c'): 'd'}, hash_function=stable_hash)
+    assert 1 + 0j in hash_table
+    assert hash_table[Decimal(1)] == 'a'
+    assert hash_table[Fraction(1, 4)] == 'b'
+    assert hash_table[(2.0, 'c')] == 'd'
+    assert Decimal('0.1') not in hashTable.from_dict({0.1: 'e'}, hash_function=stable_hash)
+
+@pytest.mark.parametrize('hash_function', HASH_FUNCTIONS)
+def test_should_fit_in_int64(hash_function):
+    for key in (0, -1, 2 ** 100, 'Hola', b'', 98.6, (None, 'a'), frozenset({1})):
+        assert -2 ** 63 <= hash_function(key) < 2 ** 63
+
+def test_should_spread_strided_ints():
+    keys = range(0, 1000 * 1429, 1429) # compare() puts 1000 keys in 1429 slots, so hash() sends them all to slot 0
+    results = compare(keys, [hash, splitmix64, fibonacci_hash])
+    assert results['splitmix64']['max_probe'] < results['hash']['max_probe']
+    assert results['fibonacci_hash']['max_probe'] < results['hash']['max_probe']
+
+def test_should_hash_the_same_in_every_process():
+    script = "from hashing import stable_hash; print(stable_hash(('Hola', b'Hello', 98.6)))"
+    outputs = {subprocess.run([sys.executable, '-c', script], env={'PYTHONHASHSEED': seed}, capture_output=True,
+                              text=True, check=True).stdout for seed in ('1', '2')}
+    assert outputs == {f"{stable_hash(('Hola', b'Hello', 98.6))}\n"}
+
+def test_should_depend_on_key():
+    assert stable_hash('a') != stable_hash(b'a')
+    assert keyed_hash(b'one')('Hola') != keyed_hash(b'two')('Hola')
+    assert random_hash()('Hola') != random_hash()('Hola')
@@ -0,0 +1,120 @@
+'''Tests for the file-backed hashTable'''
+
+import pytest
+
+from hashtable import hashTable
+from mmaptable import FileHashTable, MappedHashTable
+
+@pytest.fixture
+def path(tmp_path):
+    with hashTable.open(tmp_path / 'table.htbl', 'w') as table:
+        table['Hola'] = 'Hello'
+        table[98.6] = 37
+        table[False] = True
+        table[('composite', 1)] = [1, 2, 3]
+    return tmp_path / 'table.htbl'
+
+def test_should_open_for_writing(tmp_path):
+    table = hashTable.open(tmp_path / 'table.htbl', 'w')
+    assert isinstance(table, FileHashTable)
+    assert len(table) == 0
+
+def test_should_build_file_table_from_dict(tmp_path):
+    with FileHashTable.from_dict(tmp_path / 'table.htbl', {'Hola': 'Hello', 98.6: 37}) as table:
+        assert table.capacity == int(2 / 0.7) + 1
+    with FileHashTable.from_items(tmp_path / 'other.htbl', ((number, -number) for number in range(100))) as table:
+        table[100] = -100
+    with hashTable.open(tmp_path / 'table.htbl') as table:
+        assert table['Hola'] == 'Hello'
+    with hashTable.open(tmp_path / 'other.htbl') as table:
+        assert len(table) == 101
+
+def test_should_not_open_with_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        hashTable.open(tmp_path / 'table.htbl', 'a')
+
+def test_should_reopen_read_only(path):
+    with hashTable.open(path) as table:
+        assert isinstance(table, MappedHashTable)
+        assert len(table) == 4
+        assert table['Hola'] == 'Hello'
+        assert table[98.6] == 37
+        assert table[False] is True
+        assert table[('composite', 1)] == [1, 2, 3]
+
+def test_should_find_equal_keys(path):
+    with hashTable.open(path) as table:
+        assert table[0] is True
+        assert table[('composite', 1.0)] == [1, 2, 3]
+        assert ('compo' + 'site', True) in table
+
+def test_should_find_composite_keys_however_they_were_built(tmp_path):
+    with hashTable.open(tmp_path / 'table.htbl', 'w') as table:
+        table[('ab', 'ab')] = 'repeated'
+    with hashTable.open(tmp_path / 'table.htbl') as table:
+        assert table.get(('ab', ''.join(['a', 'b']))) == 'repeated'
+        assert list(table) == [('ab', 'ab')]
+
+def test_should_refuse_keys_it_cannot_encode_when_written(tmp_path):
+    table = hashTable.open(tmp_path / 'table.htbl', 'w')
+    table['Hola'] = 'Hello'
+    with pytest.raises(TypeError):
+        table[frozenset({1})] = 'set'
+    with pytest.raises(TypeError):
+        table.set_many([('a', 1), (frozenset(), 2)])
+    with pytest.raises(TypeError):
+        table.update(hashTable.from_dict({frozenset(): 3}))
+    with pytest.raises(TypeError):
+        table |= {frozenset(): 4}
+    assert frozenset() not in table
+    table.close()
+    with hashTable.open(tmp_path / 'table.htbl') as table:
+        assert table['Hola'] == 'Hello'
+
+def test_should_raise_error_on_missing_key(path):
+    with hashTable.open(path) as table:
+        with pytest.raises(KeyError):
+            table['Missing_Key']
+        assert 'Missing_Key' not in table
+        assert table.get('Missing_Key') is None
+        assert frozenset() not in table
+
+def test_should_keep_insertion_order(path):
+    with hashTable.open(path) as table:
+        assert list(table) == ['Hola', 98.6, False, ('composite', 1)]
+        assert table.values() == ['Hello', 37, True, [1, 2, 3]]
+
+def test_should_not_allow_writes_to_mapped_table(path):
+    with hashTable.open(path) as table:
+        with pytest.raises(TypeError):
+            table['Hola'] = 'Bonjour'
+
+def test_should_share_file_between_readers(path):
+    with hashTable.open(path) as table_1, hashTable.open(path) as table_2:
+        assert table_1.items() == table_2.items()
+
+def test_should_copy_into_writable_table(path):
+    with hashTable.open(path) as table:
+        copy = table.copy()
+    copy['new'] = 'key'
+    assert copy['Hola'] == 'Hello'
+    assert len(copy) == 5
+
+def test_should_save_large_table(tmp_path):
+    with hashTable.open(tmp_path / 'table.htbl', 'w') as table:
+        table.set_many((f'key{number}', number) for number in range(100000))
+    with hashTable.open(tmp_path / 'table.htbl') as table:
+        assert len(table) == 100000
+        assert table._indices.itemsize == 4 # White-box testing
+        assert all(table[f'key{number}'] == number for number in range(0, 100000, 997))
+
+def test_should_save_empty_table(tmp_path):
+    hashTable.open(tmp_path / 'table.htbl', 'w').close()
+    with hashTable.open(tmp_path / 'table.htbl') as table:
+        assert len(table) == 0
+        assert 'Missing_Key' not in table
+
+def test_should_not_open_other_files(tmp_path):
+    (tmp_path / 'other').write_bytes(b'not a hash table')
+    with pytest.raises(ValueError):
+        hashTable.open(tmp_path / 'other')
@@ -0,0 +1,33 @@
+'''Tests for the plotting helpers'''
+
+from hashtable import hashTable
+from plotting import compare, plot, plot_stats, probe_lengths
+
+def test_should_count_probe_lengths():
+    assert probe_lengths([1, 11, 21, 5], 10) == {1: 2, 2: 1, 3: 1}
+
+def test_should_compare_hash_functions_on_real_keys():
+    keys = [f'key{number}' for number in range(1000)]
+    results = compare(keys, {'builtin': hash, 'constant': lambda key: 0})
+    assert results['constant']['collisions'] == 999
+    assert results['constant']['max_probe'] == 1000
+    assert results['builtin']['max_probe'] < 1000
+    assert set(results['builtin']) == {'mean_probe', 'max_probe', 'collisions', 'largest_bucket'}
+
+def test_should_plot_nothing_for_empty_histogram(capsys):
+    plot({})
+    plot({}, width=10)
+    assert capsys.readouterr().out == ''
+
+def test_should_scale_plot_to_width(capsys):
+    plot({1: 1000, 2: 500}, width=10)
+    assert capsys.readouterr().out.splitlines() == [
+        f"  1 {'■' * 10} (1000)",
+        f"  2 {'■' * 5}{' ' * 5} (500)",
+    ]
+
+def test_should_plot_table_stats(capsys):
+    plot_stats(hashTable.from_dict({'a': 1, 'b': 2}).stats())
+    output = capsys.readouterr().out
+    assert 'load factor' in output
+    assert 'probe lengths' in output
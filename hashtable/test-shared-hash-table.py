@@ -0,0 +1,107 @@
+'''Tests for SharedHashTable'''
+
+import multiprocessing
+import sys
+import threading
+
+import pytest
+
+from sharedtable import SharedHashTable
+
+@pytest.fixture
+def shared_table():
+    table = SharedHashTable.from_items([('Hola', 'Hello'), (98.6, 37), (False, True)])
+    yield table
+    table.close()
+    table.unlink()
+
+def read_in_worker(name, key):
+    with SharedHashTable.attach(name) as table:
+        return table[key]
+
+def test_should_find_values(shared_table):
+    assert shared_table['Hola'] == 'Hello'
+    assert shared_table[98.6] == 37
+    assert shared_table[False] is True
+    assert len(shared_table) == 3
+    assert shared_table.get('Missing_Key') is None
+    with pytest.raises(KeyError):
+        shared_table['Missing_Key']
+
+def test_should_keep_insertion_order(shared_table):
+    assert list(shared_table) == ['Hola', 98.6, False]
+    assert shared_table.items() == [('Hola', 'Hello'), (98.6, 37), (False, True)]
+
+def test_should_find_equal_keys(shared_table):
+    shared_table[('ab', 'ab')] = 'repeated'
+    assert shared_table[('ab', ''.join(['a', 'b']))] == 'repeated'
+    assert shared_table[0] is True
+    del shared_table[98.6 + 0j]
+    assert 98.6 not in shared_table
+    assert frozenset() not in shared_table
+    with pytest.raises(TypeError):
+        shared_table[frozenset()] = 'set'
+
+def test_should_see_writes_from_attached_table(shared_table):
+    with SharedHashTable.attach(shared_table.name) as attached:
+        shared_table['Hola'] = 'Bonjour'
+        del shared_table[98.6]
+        assert attached['Hola'] == 'Bonjour'
+        assert 98.6 not in attached
+        assert len(attached) == 2
+
+def test_should_raise_error_when_full():
+    table = SharedHashTable.create(max_capacity=4, heap_bytes=1000)
+    try:
+        for key in range(table.capacity - 2):
+            table[key] = key
+        with pytest.raises(MemoryError):
+            table['one too many'] = None
+    finally:
+        table.close()
+        table.unlink()
+
+def test_should_raise_error_when_heap_is_full():
+    table = SharedHashTable.create(max_capacity=100, heap_bytes=100)
+    try:
+        with pytest.raises(MemoryError):
+            table['key'] = 'x' * 200
+        assert 'key' not in table
+    finally:
+        table.close()
+        table.unlink()
+
+@pytest.mark.skipif(sys.platform != 'linux', reason='Needs fork to hand the table name to workers cheaply')
+def test_should_read_from_worker_processes(shared_table):
+    with multiprocessing.get_context('fork').Pool(2) as pool:
+        assert pool.starmap(read_in_worker, [(shared_table.name, 'Hola'), (shared_table.name, 98.6)]) == ['Hello', 37]
+
+def test_should_never_see_torn_values():
+    table = SharedHashTable.create(max_capacity=16, heap_bytes=1 << 20)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    seen = []
+
+    def writer():
+        for number in range(2000):
+            table['pair'] = (number, -number)
+
+    def reader():
+        with SharedHashTable.attach(table.name) as attached:
+            for _ in range(2000):
+                value = attached.get('pair')
+                if value is not None and value[0] != -value[1]:
+                    seen.append(value)
+
+    try:
+        threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert seen == []
+        assert table['pair'] == (1999, -1999)
+    finally:
+        sys.setswitchinterval(interval)
+        table.close()
+        table.unlink()